@@ -0,0 +1,138 @@
+"""
+Command-line entry point.
+
+Usage:
+    python -m app serve [--host HOST] [--port PORT] [--workers N] ...
+
+Defaults come from environment variables (see app/config.py), so the same
+command works locally and on a hosting platform that sets PORT.
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+import sys
+from pathlib import Path
+
+from app.config import (
+    DATASET_MODE,
+    GRACEFUL_SHUTDOWN_SECONDS,
+    KEEP_ALIVE_SECONDS,
+    PROCESS_POOL_WORKERS,
+    SERVER_BACKLOG,
+    SERVER_HOST,
+    SERVER_HTTP,
+    SERVER_LOOP,
+    SERVER_PORT,
+    SERVER_WORKERS,
+)
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = Path(__file__).parent.parent
+
+
+def _resolve(choice: str, fast: str, fallback: str) -> str:
+    """An "auto" loop/parser setting as the implementation that will be used."""
+    if choice != "auto":
+        return choice
+    return fast if importlib.util.find_spec(fast) is not None else fallback
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app", description="Student Risk Dashboard")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Run the API server")
+    serve.add_argument("--host", default=SERVER_HOST, help="Interface to bind (HOST)")
+    serve.add_argument("--port", type=int, default=SERVER_PORT, help="Port to bind (PORT)")
+    serve.add_argument(
+        "--workers", type=int, default=SERVER_WORKERS, help="Server processes (WEB_CONCURRENCY)"
+    )
+    serve.add_argument("--loop", choices=["auto", "asyncio", "uvloop"], default=SERVER_LOOP)
+    serve.add_argument("--http", choices=["auto", "h11", "httptools"], default=SERVER_HTTP)
+    serve.add_argument(
+        "--keep-alive", type=int, default=KEEP_ALIVE_SECONDS,
+        help="Seconds an idle keep-alive connection stays open"
+    )
+    serve.add_argument(
+        "--backlog", type=int, default=SERVER_BACKLOG, help="Pending connections the OS queues"
+    )
+    serve.add_argument(
+        "--graceful-timeout", type=int, default=GRACEFUL_SHUTDOWN_SECONDS,
+        help="Seconds in-flight requests and background uploads get to finish on shutdown"
+    )
+    serve.add_argument("--no-access-log", action="store_true", help="Do not log every request")
+    serve.add_argument("--reload", action="store_true", help="Restart on code changes (development)")
+    return parser
+
+
+def _share_upload_pool(workers: int) -> None:
+    """
+    Split the default upload pool between server workers.
+
+    Each worker runs its own process pool (and upload queue), so with the
+    per-process default every worker would get one process per core.
+    """
+    if "PROCESS_POOL_WORKERS" in os.environ:
+        logger.warning(
+            f"Each of the {workers} workers runs PROCESS_POOL_WORKERS={PROCESS_POOL_WORKERS} "
+            f"upload processes ({workers * PROCESS_POOL_WORKERS} in total)"
+        )
+        return
+    per_worker = max(1, PROCESS_POOL_WORKERS // workers)
+    # Inherited by the worker processes; UPLOAD_QUEUE_LIMIT defaults to twice this
+    os.environ["PROCESS_POOL_WORKERS"] = str(per_worker)
+    logger.info(f"Upload pool: {per_worker} process(es) in each of {workers} workers")
+
+
+def serve(args: argparse.Namespace) -> None:
+    import uvicorn
+
+    # data/, db/ and static/ are relative to the project directory
+    os.chdir(PROJECT_DIR)
+
+    loop = _resolve(args.loop, "uvloop", "asyncio")
+    http = _resolve(args.http, "httptools", "h11")
+    workers = 1 if args.reload else max(1, args.workers)
+    if workers > 1 and DATASET_MODE != "shared":
+        logger.warning(
+            "Each worker keeps its own copy of the results; "
+            "set DATASET_MODE=shared to map one copy into all of them"
+        )
+    if workers > 1:
+        _share_upload_pool(workers)
+        logger.warning(
+            "Background upload jobs are tracked per worker, so /jobs/{id} polls can "
+            "reach a worker that does not know the job; use synchronous uploads"
+        )
+    logger.info(
+        f"Serving on http://{args.host}:{args.port} with {workers} worker(s), "
+        f"loop={loop}, http={http}"
+    )
+
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        timeout_keep_alive=args.keep_alive,
+        backlog=args.backlog,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        access_log=not args.no_access_log,
+        reload=args.reload,
+    )
+
+
+def main(argv=None) -> None:
+    logging.basicConfig(level=logging.INFO)
+    args = _parser().parse_args(argv)
+    if args.command == "serve":
+        serve(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
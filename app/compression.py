@@ -0,0 +1,178 @@
+"""
+Response compression: Accept-Encoding negotiation and an ASGI middleware
+that gzip- or brotli-compresses API responses, including streamed ones.
+
+Responses that already set Content-Encoding (such as the pre-compressed
+/results payloads) pass through untouched.
+"""
+
+import gzip
+import zlib
+from typing import Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP = "gzip"
+BROTLI = "br"
+
+# Best first; brotli only when the package is installed
+SUPPORTED_ENCODINGS = [BROTLI, GZIP] if brotli is not None else [GZIP]
+
+# Payloads compressed once per upload
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Responses compressed while they are sent: favour speed
+STREAM_GZIP_LEVEL = 1
+STREAM_BROTLI_QUALITY = 4
+
+# Bodies smaller than this are not worth compressing
+MINIMUM_SIZE = 1024
+
+_COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson", "application/javascript")
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a complete body with the given content coding."""
+    if encoding == BROTLI:
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _quality(params: str) -> float:
+    """The q-value of an Accept-Encoding entry (1 if absent or malformed)."""
+    for param in params.split(';'):
+        key, _, value = param.strip().partition('=')
+        if key.lower() == 'q':
+            try:
+                return float(value)
+            except ValueError:
+                return 1.0
+    return 1.0
+
+
+def preferred_encoding(
+    accept_encoding: str, available: Sequence[str] = SUPPORTED_ENCODINGS
+) -> Optional[str]:
+    """
+    The best of the available content codings an Accept-Encoding header allows.
+
+    Returns None if the client accepts none of them (send the body as is).
+    """
+    qualities = {}
+    for coding in accept_encoding.split(','):
+        name, _, params = coding.partition(';')
+        qualities[name.strip().lower()] = _quality(params)
+
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = qualities.get(encoding, qualities.get('*', 0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class _StreamCompressor:
+    """Incremental compressor that flushes after every chunk."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == BROTLI:
+            self._compressor = brotli.Compressor(quality=STREAM_BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(STREAM_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == BROTLI:
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == BROTLI:
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """Compress text and JSON responses with the client's preferred coding."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = preferred_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSender(send, encoding, self.minimum_size).send)
+
+
+class _CompressingSender:
+    """Wraps an ASGI send callable, compressing the response body."""
+
+    def __init__(self, send: Send, encoding: str, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self._start: Optional[Message] = None
+        self._compressor: Optional[_StreamCompressor] = None
+        self._passthrough = False
+
+    def _compressible(self, start: Message) -> bool:
+        headers = Headers(raw=start["headers"])
+        if start["status"] < 200 or start["status"] in (204, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        return headers.get("content-type", "").startswith(_COMPRESSIBLE_TYPES)
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            self._passthrough = not self._compressible(message)
+            if self._passthrough:
+                await self._send(message)
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._compressor is None:
+            if not more_body and len(body) < self.minimum_size:
+                # Small, complete body: send as is
+                self._passthrough = True
+                await self._send(self._start)
+                await self._send(message)
+                return
+
+            self._compressor = _StreamCompressor(self.encoding)
+            headers = MutableHeaders(raw=self._start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = self._compressor.compress(body) + self._compressor.finish()
+                headers["Content-Length"] = str(len(body))
+                await self._send(self._start)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+            await self._send(self._start)
+
+        chunk = self._compressor.compress(body)
+        if not more_body:
+            chunk += self._compressor.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -0,0 +1,59 @@
+"""
+Conditional GET support: ETag / Last-Modified validators and 304 checks.
+
+Every response built from a Dataset carries that dataset's validators,
+so clients that poll get 304 Not Modified until a new upload lands.
+"""
+
+from email.utils import parsedate_to_datetime
+from typing import Dict
+
+from fastapi import Request, Response
+
+from app.dataset import Dataset
+
+
+def validator_headers(dataset: Dataset) -> Dict[str, str]:
+    """ETag and Last-Modified for responses built from dataset."""
+    return {
+        "ETag": dataset.etag,
+        "Last-Modified": dataset.last_modified,
+        # Cache, but revalidate before every reuse
+        "Cache-Control": "no-cache",
+    }
+
+
+def _opaque_tag(etag: str) -> str:
+    """An entity tag without its weak prefix (weak comparison)."""
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def is_not_modified(request: Request, dataset: Dataset) -> bool:
+    """
+    True if the request's validators still match dataset.
+
+    If-None-Match takes precedence; If-Modified-Since is only used
+    without it.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        current = _opaque_tag(dataset.etag)
+        return any(
+            tag.strip() == "*" or _opaque_tag(tag) == current for tag in if_none_match.split(",")
+        )
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have whole-second resolution
+        return int(dataset.updated_at) <= since
+    return False
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    """A bodyless 304 carrying the response's validators."""
+    return Response(status_code=304, headers=headers)
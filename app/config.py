@@ -0,0 +1,81 @@
+"""
+Runtime settings for Student Risk Dashboard, read from environment variables.
+"""
+
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting, falling back to the default."""
+    value = os.environ.get(name)
+    try:
+        return int(value) if value else default
+    except ValueError:
+        return default
+
+
+# Uploads larger than this are rejected with 413
+MAX_UPLOAD_BYTES = _env_int("MAX_UPLOAD_MB", 500) * 1024 * 1024
+
+# Uploads larger than this are processed with the streaming reader
+STREAMING_THRESHOLD_BYTES = _env_int("STREAMING_THRESHOLD_MB", 50) * 1024 * 1024
+
+# Rows per chunk in streaming mode (bounds peak memory)
+STREAMING_CHUNK_SIZE = _env_int("STREAMING_CHUNK_SIZE", 50_000)
+
+# On-disk cache of processed uploads (0 disables the cache)
+RESULT_CACHE_DIR = os.environ.get("RESULT_CACHE_DIR", "data/cache")
+RESULT_CACHE_MAX_BYTES = _env_int("RESULT_CACHE_MAX_MB", 512) * 1024 * 1024
+
+# Worker processes for upload processing (defaults to the host's cores)
+PROCESS_POOL_WORKERS = max(1, _env_int("PROCESS_POOL_WORKERS", os.cpu_count() or 1))
+
+# Uploads allowed to run or wait for a worker before new ones get 503
+UPLOAD_QUEUE_LIMIT = max(1, _env_int("UPLOAD_QUEUE_LIMIT", 2 * PROCESS_POOL_WORKERS))
+
+# How long finished background upload jobs stay queryable at /jobs/{id}
+JOB_TTL_SECONDS = _env_int("JOB_TTL_SECONDS", 3600)
+
+# Format of processed results files: "csv" or "parquet"
+RESULTS_FORMAT = os.environ.get("RESULTS_FORMAT", "csv").lower()
+if RESULTS_FORMAT not in ("csv", "parquet"):
+    RESULTS_FORMAT = "csv"
+
+# Most student IDs accepted by one POST /students/lookup
+STUDENT_LOOKUP_MAX_IDS = _env_int("STUDENT_LOOKUP_MAX_IDS", 1000)
+
+# SQLite database holding the current results
+RESULT_DB_PATH = os.environ.get("RESULT_DB_PATH", "db/results.db")
+
+# How each server process holds the current results: "memory" (its own copy)
+# or "shared" (memory-mapped files shared by all uvicorn workers)
+DATASET_MODE = os.environ.get("DATASET_MODE", "memory").lower()
+if DATASET_MODE not in ("memory", "shared"):
+    DATASET_MODE = "memory"
+
+# Where shared datasets are published
+SHARED_DATASET_DIR = os.environ.get("SHARED_DATASET_DIR", "data/shared")
+
+# Production server (python -m app serve); HOST, PORT and WEB_CONCURRENCY
+# follow the usual hosting-platform names
+SERVER_HOST = os.environ.get("HOST", "127.0.0.1")
+SERVER_PORT = _env_int("PORT", 8001)
+SERVER_WORKERS = max(1, _env_int("WEB_CONCURRENCY", 1))
+
+# Event loop ("auto", "asyncio" or "uvloop") and HTTP parser ("auto", "h11"
+# or "httptools"); auto picks uvloop and httptools when installed
+SERVER_LOOP = os.environ.get("SERVER_LOOP", "auto").lower()
+if SERVER_LOOP not in ("auto", "asyncio", "uvloop"):
+    SERVER_LOOP = "auto"
+SERVER_HTTP = os.environ.get("SERVER_HTTP", "auto").lower()
+if SERVER_HTTP not in ("auto", "h11", "httptools"):
+    SERVER_HTTP = "auto"
+
+# Idle keep-alive connections are closed after this long
+KEEP_ALIVE_SECONDS = _env_int("KEEP_ALIVE_SECONDS", 5)
+
+# Connections the OS queues while every worker is busy
+SERVER_BACKLOG = _env_int("SERVER_BACKLOG", 2048)
+
+# On shutdown, how long in-flight requests and background uploads may finish
+GRACEFUL_SHUTDOWN_SECONDS = _env_int("GRACEFUL_SHUTDOWN_SECONDS", 30)
@@ -0,0 +1,172 @@
+"""
+Process-level cache of the processed results dataset.
+
+The stored results are loaded, sorted and rendered to response bytes
+once; later reads reuse them until the store holds a new version.
+"""
+
+import logging
+import threading
+import time
+from email.utils import formatdate
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import orjson
+import pandas as pd
+
+from app.pagination import SORT_COLUMNS
+from app.serialization import RenderedResults, render_results, text_values
+from app.store import ResultStore
+from app.summary import build_program_summaries, build_summary
+
+logger = logging.getLogger(__name__)
+
+# Display order: High Risk first, then At Risk, then Safe (others last)
+RISK_SORT_ORDER = {'High Risk': 0, 'At Risk': 1, 'Safe': 2}
+AT_RISK_LABELS = ['At Risk', 'High Risk']
+
+
+class Dataset:
+    """Parsed results, sorted by risk, with a precomputed at-risk view."""
+
+    def __init__(self, frame: pd.DataFrame, version: str = '', updated_at: Optional[float] = None):
+        # Identifies this load of the results (cursors and ETags are tied to it)
+        self.version = version
+        self.updated_at = updated_at if updated_at is not None else time.time()
+        self.last_modified = formatdate(self.updated_at, usegmt=True)
+        sort_order = frame['risk_label'].map(RISK_SORT_ORDER)
+        self.frame = frame.iloc[sort_order.argsort(kind='stable')].reset_index(drop=True)
+        self._at_risk_mask = self.frame['risk_label'].isin(AT_RISK_LABELS).to_numpy()
+        self.at_risk = self.frame[self._at_risk_mask]
+        self.risk_counts: Dict[str, int] = self.frame['risk_label'].value_counts().to_dict()
+        # student_id (as /results shows it) -> row position; first row wins
+        ids = text_values(self.frame['student_id']).tolist()
+        self._positions: Dict[str, int] = {}
+        for position, student_id in enumerate(ids):
+            self._positions.setdefault(student_id, position)
+        # Row positions per (sort key, descending, at_risk_only), built on first use
+        self._orders: Dict[Tuple[str, bool, bool], np.ndarray] = {}
+        # /summary and /summary/programs bodies
+        self.summary_json = orjson.dumps(build_summary(self.frame).model_dump())
+        self.programs_json = orjson.dumps(
+            [summary.model_dump() for summary in build_program_summaries(self.frame)]
+        )
+        # /results payloads, keyed by at_risk_only
+        self._rendered = {
+            False: render_results(self.frame),
+            True: render_results(self.at_risk),
+        }
+
+    @property
+    def etag(self) -> str:
+        """Weak ETag for responses built from this dataset."""
+        return f'W/"{self.version}"'
+
+    def count(self, at_risk_only: bool = False) -> int:
+        """Number of students in a view."""
+        return int(self._at_risk_mask.sum()) if at_risk_only else len(self.frame)
+
+    def position(self, student_id: str) -> Optional[int]:
+        """Row position of a student in self.frame, or None if unknown."""
+        return self._positions.get(student_id)
+
+    def _sort_values(self, key: str) -> pd.Series:
+        if key == 'risk':
+            return self.frame['risk_label'].map(RISK_SORT_ORDER)
+        if key == 'name':
+            # Missing names stay missing, so they sort last (not as 'nan')
+            names = self.frame['student_name']
+            return text_values(names).str.casefold().where(names.notna().to_numpy())
+        return self.frame[SORT_COLUMNS[key]]
+
+    def order(self, key: str, descending: bool = False, at_risk_only: bool = False) -> np.ndarray:
+        """
+        Row positions in self.frame sorted by a SORT_COLUMNS key.
+
+        Ties keep the risk display order; missing values sort last.
+        """
+        index_key = (key, descending, at_risk_only)
+        order = self._orders.get(index_key)
+        if order is None:
+            if at_risk_only:
+                order = self.order(key, descending)
+                order = order[self._at_risk_mask[order]]
+            else:
+                values = self._sort_values(key)
+                order = values.sort_values(
+                    ascending=not descending, kind='stable', na_position='last'
+                ).index.to_numpy()
+            self._orders[index_key] = order
+        return order
+
+    def rendered(self, at_risk_only: bool = False) -> RenderedResults:
+        """The /results payload for a view, as plain and gzip bytes."""
+        return self._rendered[at_risk_only]
+
+
+class DatasetCache:
+    """Holds the Dataset for a result store, reloading when its version changes."""
+
+    def __init__(self, store: ResultStore):
+        self.store = store
+        # (store version, dataset), replaced as a unit so readers never see a mix.
+        # Readers take the reference without locking (read-copy-update): a swap
+        # never waits for them, and a replaced dataset is freed once the last
+        # request still using it (e.g. an NDJSON stream) lets go
+        self._state: Tuple[Optional[str], Optional[Dataset]] = (None, None)
+        # Held while a dataset is built; requests never wait for it
+        self._lock = threading.Lock()
+        # store.data_version() when the loaded state was last checked against the store
+        self._data_version: Optional[int] = None
+
+    @property
+    def loading(self) -> bool:
+        """Whether a dataset is being built."""
+        return self._lock.locked()
+
+    def _load(self) -> Optional[Dataset]:
+        """Build the dataset from the store (caller holds the lock)."""
+        stored = self.store.read()
+        if stored is None:
+            self._state = (None, None)
+            return None
+        logger.info(f"Loading dataset version {stored.version}")
+        dataset = Dataset(stored.frame, version=stored.version, updated_at=stored.updated_at)
+        self._state = (stored.version, dataset)
+        return dataset
+
+    def _refresh(self, data_version: int) -> None:
+        """Background thread: build the stored version unless it is already loaded."""
+        try:
+            if self.store.version() != self._state[0]:
+                self._load()
+            self._data_version = data_version
+        except Exception as e:
+            logger.error(f"Could not load dataset: {e}", exc_info=True)
+        finally:
+            self._lock.release()
+
+    def get(self) -> Optional[Dataset]:
+        """
+        Return the current dataset, or None if none has been loaded yet.
+
+        Never blocks: when the store has changed (e.g. another worker
+        stored an upload), the loaded dataset is still returned while the
+        new one is built in a background thread.
+        """
+        dataset = self._state[1]
+        data_version = self.store.data_version()
+        if data_version != self._data_version and self._lock.acquire(blocking=False):
+            threading.Thread(
+                target=self._refresh, args=(data_version,), name="dataset-refresh", daemon=True
+            ).start()
+        return dataset
+
+    def reload(self) -> Optional[Dataset]:
+        """Rebuild the dataset now (e.g. right after an upload stores new results)."""
+        with self._lock:
+            data_version = self.store.data_version()
+            dataset = self._load()
+            self._data_version = data_version
+            return dataset
@@ -0,0 +1,143 @@
+"""
+In-process registry of background upload jobs.
+
+Jobs record when each pipeline stage started so /jobs/{id} can report
+stage-level progress. Finished jobs are dropped after a TTL.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.models import ExcelUploadResponse, JobStage, JobStatus
+from utils.data_preprocessing import PIPELINE_STAGES
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+STAGE_PENDING = "pending"
+STAGE_RUNNING = "running"
+STAGE_DONE = "done"
+# A completed job never ran the stage (e.g. its results came from the cache)
+STAGE_SKIPPED = "skipped"
+
+
+class UploadJob:
+    """State of one background upload."""
+
+    def __init__(self, filename: str):
+        self.job_id = uuid.uuid4().hex
+        self.filename = filename
+        self.status = JOB_QUEUED
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.stage_started: Dict[str, float] = {}
+        self.result: Optional[ExcelUploadResponse] = None
+        self.error: Optional[str] = None
+        # Keeps the processing task referenced while it runs
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def stage(self) -> Optional[str]:
+        """The most recently started stage."""
+        return next(reversed(self.stage_started), None)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_COMPLETED, JOB_FAILED)
+
+    def start_stage(self, stage: str, timestamp: Optional[float] = None) -> None:
+        """Record that a pipeline stage started."""
+        self.status = JOB_RUNNING
+        self.stage_started.setdefault(stage, timestamp or time.time())
+
+    def complete(self, result: ExcelUploadResponse) -> None:
+        self.status = JOB_COMPLETED
+        self.result = result
+        self.finished_at = time.time()
+
+    def fail(self, error: str) -> None:
+        self.status = JOB_FAILED
+        self.error = error
+        self.finished_at = time.time()
+
+    def to_status(self) -> JobStatus:
+        """Build the API view of this job."""
+        now = self.finished_at or time.time()
+        started = list(self.stage_started)
+
+        stages = []
+        for name in PIPELINE_STAGES:
+            if name not in self.stage_started:
+                skipped = self.status == JOB_COMPLETED
+                stages.append(JobStage(name=name, status=STAGE_SKIPPED if skipped else STAGE_PENDING))
+                continue
+            # A stage runs until the next one starts (or the job finishes)
+            position = started.index(name)
+            is_last = position == len(started) - 1
+            start = self.stage_started[name]
+            end = now if is_last else self.stage_started[started[position + 1]]
+            is_current = is_last and not self.finished
+            stages.append(JobStage(
+                name=name,
+                status=STAGE_RUNNING if is_current else STAGE_DONE,
+                started_at=datetime.utcfromtimestamp(start),
+                elapsed_seconds=round(end - start, 3),
+            ))
+
+        return JobStatus(
+            job_id=self.job_id,
+            filename=self.filename,
+            status=self.status,
+            stage=self.stage,
+            stages=stages,
+            created_at=datetime.utcfromtimestamp(self.created_at),
+            elapsed_seconds=round(now - self.created_at, 3),
+            result=self.result,
+            error=self.error,
+        )
+
+
+class JobRegistry:
+    """Background upload jobs by ID; finished jobs expire after ttl_seconds."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[str, UploadJob] = {}
+
+    def create(self, filename: str) -> UploadJob:
+        self.purge_expired()
+        job = UploadJob(filename)
+        self._jobs[job.job_id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[UploadJob]:
+        self.purge_expired()
+        return self._jobs.get(job_id)
+
+    def purge_expired(self) -> None:
+        """Drop finished jobs older than the TTL."""
+        cutoff = time.time() - self.ttl_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    async def drain(self, timeout: float) -> None:
+        """Wait up to timeout seconds for running jobs to finish (on shutdown)."""
+        tasks = [job.task for job in self._jobs.values() if job.task is not None and not job.task.done()]
+        if not tasks:
+            return
+        logger.info(f"Waiting for {len(tasks)} background upload(s) to finish")
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        if pending:
+            logger.warning(f"{len(pending)} background upload(s) still running at shutdown")
@@ -2,18 +2,63 @@
 FastAPI Student Risk Dashboard - Clean Version
 """
 
+import asyncio
 import logging
+import mmap
 from datetime import datetime
 from pathlib import Path
-from typing import List
-import pandas as pd
+from typing import Callable, Dict, List, Optional
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, status, Query
+from fastapi import FastAPI, File, UploadFile, HTTPException, status, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+import orjson
 
-from app.models import StudentRiskPrediction, ExcelUploadResponse
+from app.compression import CompressionMiddleware, preferred_encoding
+from app.conditional import is_not_modified, not_modified_response, validator_headers
+from app.config import (
+    DATASET_MODE,
+    GRACEFUL_SHUTDOWN_SECONDS,
+    JOB_TTL_SECONDS,
+    MAX_UPLOAD_BYTES,
+    PROCESS_POOL_WORKERS,
+    RESULT_CACHE_DIR,
+    RESULT_DB_PATH,
+    RESULTS_FORMAT,
+    RESULT_CACHE_MAX_BYTES,
+    SHARED_DATASET_DIR,
+    STREAMING_CHUNK_SIZE,
+    STREAMING_THRESHOLD_BYTES,
+    UPLOAD_QUEUE_LIMIT,
+)
+from app.dataset import Dataset, DatasetCache
+from app.jobs import JobRegistry, UploadJob
+from app.models import (
+    StudentRiskPrediction,
+    StudentLookupRequest,
+    StudentLookupResponse,
+    ExcelUploadResponse,
+    JobAccepted,
+    JobStatus,
+    ProgramSummary,
+    RiskSummary,
+)
+from app.pagination import (
+    DEFAULT_SORT,
+    PageCursor,
+    decode_cursor,
+    encode_cursor,
+    parse_fields,
+    parse_sort,
+)
+from app.processing import ClientDisconnected, UploadProcessor
+from app.result_cache import ResultCache
+from app.serialization import encode_results, iter_ndjson, result_records
+from app.shared_dataset import SharedDatasetCache, SharedDatasetDirectory, iter_payload
+from app.snapshots import SnapshotDirectory
+from app.store import ResultStore
+from app.uploads import SavedUpload, save_upload
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -22,7 +67,14 @@ logger = logging.getLogger(__name__)
 # Import after path setup
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
-from utils.data_preprocessing import process_excel_file
+from utils.file_formats import SUPPORTED_EXTENSIONS
+from utils.result_files import RESULT_SUFFIXES
+
+# Versioned results files (CSV or Parquet), one per upload
+result_snapshots = SnapshotDirectory(Path("data") / "results", RESULT_SUFFIXES[RESULTS_FORMAT])
+
+# Single results file written before snapshots existed
+LEGACY_RESULTS_PATH = Path("data") / f"processed_students{result_snapshots.suffix}"
 
 # Create FastAPI app
 app = FastAPI(title="Student Risk Dashboard API", version="1.0.0")
@@ -34,8 +86,38 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Total-Count",
+        "X-Student-Count",
+        "X-High-Risk-Count",
+        "X-At-Risk-Count",
+        "X-Safe-Count",
+        "X-Next-Cursor",
+    ],
 )
 
+# gzip/brotli for API and static responses
+app.add_middleware(CompressionMiddleware)
+
+# Processed results keyed by upload content
+result_cache = ResultCache(
+    Path(RESULT_CACHE_DIR), RESULT_CACHE_MAX_BYTES, f"results{result_snapshots.suffix}"
+)
+
+# Uploads are parsed and scored in worker processes
+upload_processor = UploadProcessor(PROCESS_POOL_WORKERS, UPLOAD_QUEUE_LIMIT)
+
+# Background upload jobs (?background=true)
+upload_jobs = JobRegistry(JOB_TTL_SECONDS)
+
+# Current results, and the parsed, sorted copy served by /results
+result_store = ResultStore(Path(RESULT_DB_PATH))
+if DATASET_MODE == "shared":
+    # One memory-mapped copy for all worker processes
+    dataset_cache = SharedDatasetCache(result_store, SharedDatasetDirectory(Path(SHARED_DATASET_DIR)))
+else:
+    dataset_cache = DatasetCache(result_store)
+
 # Ensure directories exist (will be created on startup)
 # Note: Directory creation moved to startup event to avoid permission issues
 
@@ -52,7 +134,7 @@ async def root():
 # Startup event to create directories
 @app.on_event("startup")
 async def startup_event():
-    """Create necessary directories on startup."""
+    """Create necessary directories and the result store on startup."""
     try:
         data_dir = Path("data")
         static_dir = Path("static")
@@ -64,11 +146,34 @@ async def startup_event():
             static_dir.mkdir(parents=True, exist_ok=True)
         if not db_dir.exists():
             db_dir.mkdir(parents=True, exist_ok=True)
+        if result_cache.enabled:
+            result_cache.cache_dir.mkdir(parents=True, exist_ok=True)
             
         logger.info("Directories verified")
     except Exception as e:
         logger.warning(f"Could not create directories: {e}")
         # Continue anyway - directories might already exist
+    
+    result_store.initialize()
+    result_snapshots.initialize()
+    
+    # Results from before the store existed (one worker imports them)
+    with result_snapshots.publish_lock():
+        if result_store.version() is None:
+            results_path = result_snapshots.current_path() or LEGACY_RESULTS_PATH
+            if results_path.exists():
+                logger.info(f"Importing {results_path} into {result_store.db_path}")
+                result_store.import_file(results_path, result_snapshots.current_version())
+    
+    # Requests never build the dataset, so have it ready before serving
+    await asyncio.to_thread(dataset_cache.reload)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Let background uploads finish, then stop the upload process pool."""
+    await upload_jobs.drain(GRACEFUL_SHUTDOWN_SECONDS)
+    upload_processor.shutdown()
 
 
 # Mount static files (only if directory exists)
@@ -79,71 +184,304 @@ else:
     logger.warning("Static directory not found - static files may not be accessible")
 
 
-@app.post("/upload-excel", response_model=ExcelUploadResponse)
-async def upload_excel(file: UploadFile = File(...), train_model: bool = Query(False)):
-    """Upload and process Excel file."""
-    if not file.filename or not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="Must upload Excel file (.xlsx or .xls)")
+def store_results(output_path: Path, version: str) -> bool:
+    """
+    Import a snapshot and publish it, one upload at a time across all workers.
+
+    Returns False, doing nothing, if version is already the stored one.
+    """
+    with result_snapshots.publish_lock():
+        if result_store.version() == version:
+            return False
+        result_store.import_file(output_path, version)
+        result_snapshots.publish(version)
+    return True
+
+
+async def process_saved_upload(
+    filename: str,
+    upload: SavedUpload,
+    request: Optional[Request] = None,
+    on_progress: Optional[Callable[[str, float], None]] = None
+) -> ExcelUploadResponse:
+    """Process a saved upload (or reuse cached results) and publish them."""
+    # Results go to a snapshot of their own, named by the upload's content hash,
+    # so concurrent uploads never overwrite each other's files
+    with result_snapshots.pinned(upload.cache_key) as output_path:
+        # Identical upload already processed: reuse its results
+        # (cache reads and copies run off the event loop, like the store import)
+        stats = await asyncio.to_thread(result_cache.get, upload.cache_key)
+        if stats is not None:
+            logger.info(f"Result cache hit for {filename}")
+            upload.path.unlink(missing_ok=True)
+            # Snapshots only appear complete (atomic rename), so an existing one is reusable
+            if not output_path.exists():
+                await asyncio.to_thread(result_cache.activate, upload.cache_key, output_path)
+        else:
+            # Large workbooks are streamed in chunks to bound memory
+            streaming = upload.path.suffix == '.xlsx' and upload.size > STREAMING_THRESHOLD_BYTES
+            
+            # Process the upload's own file in a worker process
+            stats = await upload_processor.run(
+                upload.path, output_path, streaming, STREAMING_CHUNK_SIZE, request, on_progress
+            )
+            
+            await asyncio.to_thread(result_cache.put, upload.cache_key, output_path, stats)
+        
+        # Store the new results and swap the CURRENT pointer together, so the two
+        # always agree (versioned by content hash: identical data keeps its ETag)
+        stored = await asyncio.to_thread(store_results, output_path, upload.cache_key)
+    
+    if stored:
+        # Parse and render the new results now, not on the first read
+        await asyncio.to_thread(dataset_cache.reload)
+    else:
+        logger.info(f"Results of {filename} are already current")
     
+    students_processed = stats['total_students']
+    
+    return ExcelUploadResponse(
+        message=f"Processed {students_processed} students successfully",
+        students_processed=students_processed,
+        at_risk_count=stats['at_risk_count'],
+        safe_count=stats['safe_count'],
+        avg_grade=round(stats['avg_grade'], 2),
+        avg_attendance=round(stats['avg_attendance'], 2),
+        imputed_grades_by_program=stats['imputed_grades_by_program'],
+        timestamp=datetime.utcnow()
+    )
+
+
+async def run_upload_job(job: UploadJob, upload: SavedUpload) -> None:
+    """Process an upload in the background, recording progress on the job."""
     try:
-        # Save file
-        data_dir = Path("data")
-        file_path = data_dir / file.filename
-        content = await file.read()
-        file_path.write_bytes(content)
-        
-        # Process file
-        df, stats = process_excel_file(file_path)
-        
-        # Save results
-        output_path = data_dir / "processed_students.csv"
-        df.to_csv(output_path, index=False)
-        
-        return ExcelUploadResponse(
-            message=f"Processed {len(df)} students successfully",
-            students_processed=len(df),
-            at_risk_count=stats['at_risk_count'],
-            safe_count=stats['safe_count'],
-            avg_grade=round(stats['avg_grade'], 2),
-            avg_attendance=round(stats['avg_attendance'], 2),
-            timestamp=datetime.utcnow()
+        job.complete(await process_saved_upload(job.filename, upload, on_progress=job.start_stage))
+    except HTTPException as e:
+        job.fail(str(e.detail))
+    except Exception as e:
+        logger.error(f"Upload job {job.job_id} failed: {e}", exc_info=True)
+        job.fail(str(e))
+    finally:
+        upload.path.unlink(missing_ok=True)
+
+
+@app.post(
+    "/upload-excel",
+    response_model=ExcelUploadResponse,
+    responses={202: {"model": JobAccepted, "description": "Accepted for background processing"}}
+)
+async def upload_excel(
+    request: Request,
+    file: UploadFile = File(...),
+    train_model: bool = Query(False),
+    background: bool = Query(False, description="Return 202 with a job ID and process in the background")
+):
+    """Upload and process Excel, CSV, Parquet or Arrow file."""
+    if not file.filename or Path(file.filename).suffix.lower() not in SUPPORTED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type. Upload one of: {', '.join(SUPPORTED_EXTENSIONS)}"
+        )
+    
+    # Refuse before writing anything to disk
+    if upload_processor.busy:
+        raise HTTPException(
+            status_code=503, detail="Too many uploads in progress. Please retry shortly."
         )
+    
+    # Stream the upload to disk in chunks, hashing as it goes
+    upload = await save_upload(file, Path("data"), MAX_UPLOAD_BYTES)
+    
+    if background:
+        job = upload_jobs.create(file.filename)
+        job.task = asyncio.create_task(run_upload_job(job, upload))
+        status_url = f"/jobs/{job.job_id}"
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=JobAccepted(job_id=job.job_id, status=job.status, status_url=status_url).model_dump(),
+            headers={"Location": status_url}
+        )
+    
+    try:
+        return await process_saved_upload(file.filename, upload, request)
+    except HTTPException:
+        raise
+    except ClientDisconnected:
+        logger.info(f"Client disconnected, upload of {file.filename} cancelled")
+        raise HTTPException(status_code=499, detail="Client disconnected")
     except Exception as e:
         logger.error(f"Error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        upload.path.unlink(missing_ok=True)
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """Get status, stage progress and result of a background upload."""
+    job = upload_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job.to_status()
+
+
+def _count_headers(dataset: Dataset, total: int) -> Dict[str, str]:
+    """Totals for the dashboard summary, so clients never need the full list."""
+    return {
+        "X-Total-Count": str(total),
+        "X-Student-Count": str(len(dataset.frame)),
+        "X-High-Risk-Count": str(dataset.risk_counts.get("High Risk", 0)),
+        "X-At-Risk-Count": str(dataset.risk_counts.get("At Risk", 0)),
+        "X-Safe-Count": str(dataset.risk_counts.get("Safe", 0)),
+    }
+
+
+def _current_dataset() -> Dataset:
+    dataset = dataset_cache.get()
+    if dataset is None and dataset_cache.loading:
+        raise HTTPException(
+            status_code=503, detail="Results are loading. Please retry shortly.",
+            headers={"Retry-After": "1"}
+        )
+    if dataset is None:
+        raise HTTPException(status_code=404, detail="No data found. Upload Excel file first.")
+    return dataset
 
 
 @app.get("/results", response_model=List[StudentRiskPrediction])
-async def get_results(at_risk_only: bool = Query(False)):
-    """Get processed results."""
-    output_path = Path("data") / "processed_students.csv"
+async def get_results(
+    request: Request,
+    at_risk_only: bool = Query(False),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of students to return"),
+    offset: Optional[int] = Query(None, ge=0, description="Number of students to skip"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from a previous page"),
+    sort: Optional[str] = Query(
+        None, description="risk, grade, attendance or name; prefix with - for descending"
+    ),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to include"),
+    output_format: Optional[str] = Query(
+        None, alias="format", description="ndjson streams one student per line"
+    ),
+):
+    """Get processed results, optionally paged, sorted, projected or streamed."""
+    dataset = _current_dataset()
     
-    if not output_path.exists():
-        raise HTTPException(status_code=404, detail="No data found. Upload Excel file first.")
+    if output_format not in (None, "json", "ndjson"):
+        raise HTTPException(status_code=400, detail="Invalid format. Use json or ndjson.")
+    streaming = output_format == "ndjson"
+    
+    paged = any(param is not None for param in (limit, offset, cursor, sort, fields))
+    if not paged and not streaming:
+        headers = validator_headers(dataset)
+        headers["Vary"] = "Accept-Encoding"
+        if is_not_modified(request, dataset):
+            return not_modified_response(headers)
+        
+        # Sorted (High Risk first, then At Risk, then Safe) and encoded at upload time;
+        # response_model only documents the schema
+        rendered = dataset.rendered(at_risk_only)
+        headers.update(_count_headers(dataset, dataset.count(at_risk_only)))
+        encoding = preferred_encoding(request.headers.get("accept-encoding", ""), list(rendered.compressed))
+        content = rendered.body
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+            content = rendered.compressed[encoding]
+        if isinstance(content, mmap.mmap):
+            # Shared dataset: payload pages are shared through the page cache
+            headers["Content-Length"] = str(len(content))
+            return StreamingResponse(iter_payload(content), media_type="application/json", headers=headers)
+        return Response(content=content, media_type="application/json", headers=headers)
+    
+    try:
+        if cursor is not None:
+            # The cursor carries the listing it was issued for
+            sort, at_risk_only, offset = decode_cursor(cursor, dataset.version)
+        sort = sort or DEFAULT_SORT
+        sort_key, descending = parse_sort(sort)
+        selected_fields = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    df = pd.read_csv(output_path)
-    
-    if at_risk_only:
-        df = df[df['risk_label'].isin(['At Risk', 'High Risk'])]
-    
-    # Sort: High Risk first, then At Risk, then Safe
-    df['sort_order'] = df['risk_label'].map({'High Risk': 0, 'At Risk': 1, 'Safe': 2})
-    df = df.sort_values('sort_order').drop('sort_order', axis=1)
-    
-    results = []
-    for _, row in df.iterrows():
-        results.append(StudentRiskPrediction(
-            student_id=str(row['student_id']),
-            student_name=str(row['student_name']),
-            program=str(row.get('program', 'Unknown')),
-            grade=float(row['grade']),
-            attendance_rate=float(row['attendance_rate']),
-            risk_label=str(row['risk_label']),
-            recommended_action=str(row['recommended_action']),
-            email=str(row.get('email', ''))
-        ))
-    
-    return results
+    headers = validator_headers(dataset)
+    if is_not_modified(request, dataset):
+        return not_modified_response(headers)
+    
+    order = dataset.order(sort_key, descending, at_risk_only)
+    start = min(offset or 0, len(order))
+    end = len(order) if limit is None else min(start + limit, len(order))
+    
+    headers.update(_count_headers(dataset, len(order)))
+    if end < len(order):
+        headers["X-Next-Cursor"] = encode_cursor(
+            dataset.version, PageCursor(sort, at_risk_only, end)
+        )
+    
+    if streaming:
+        # Rows are encoded batch by batch as the client reads
+        return StreamingResponse(
+            iter_ndjson(dataset.frame, order[start:end], selected_fields),
+            media_type="application/x-ndjson",
+            headers=headers,
+        )
+    
+    page = dataset.frame.iloc[order[start:end]]
+    return Response(
+        content=encode_results(page, selected_fields), media_type="application/json", headers=headers
+    )
+
+
+@app.get("/students/{student_id}", response_model=StudentRiskPrediction)
+async def get_student(request: Request, student_id: str):
+    """Get one student's risk prediction by student ID."""
+    dataset = _current_dataset()
+    position = dataset.position(student_id)
+    if position is None:
+        raise HTTPException(status_code=404, detail=f"Student {student_id} not found")
+    
+    headers = validator_headers(dataset)
+    if is_not_modified(request, dataset):
+        return not_modified_response(headers)
+    
+    record = result_records(dataset.frame.iloc[[position]])[0]
+    return Response(content=orjson.dumps(record), media_type="application/json", headers=headers)
+
+
+@app.post("/students/lookup", response_model=StudentLookupResponse)
+async def lookup_students(lookup: StudentLookupRequest):
+    """Get several students by ID; unknown IDs are listed in not_found."""
+    dataset = _current_dataset()
+    
+    positions = []
+    not_found = []
+    for student_id in dict.fromkeys(str(student_id) for student_id in lookup.student_ids):
+        position = dataset.position(student_id)
+        if position is None:
+            not_found.append(student_id)
+        else:
+            positions.append(position)
+    
+    body = {"students": result_records(dataset.frame.iloc[positions]), "not_found": not_found}
+    return Response(content=orjson.dumps(body), media_type="application/json")
+
+
+@app.get("/summary", response_model=RiskSummary)
+async def get_summary(request: Request):
+    """Risk counts and average grade/attendance across all students."""
+    dataset = _current_dataset()
+    headers = validator_headers(dataset)
+    if is_not_modified(request, dataset):
+        return not_modified_response(headers)
+    return Response(content=dataset.summary_json, media_type="application/json", headers=headers)
+
+
+@app.get("/summary/programs", response_model=List[ProgramSummary])
+async def get_program_summaries(request: Request):
+    """Per-program counts, averages and students per risk label."""
+    dataset = _current_dataset()
+    headers = validator_headers(dataset)
+    if is_not_modified(request, dataset):
+        return not_modified_response(headers)
+    return Response(content=dataset.programs_json, media_type="application/json", headers=headers)
 
 
 if __name__ == "__main__":
@@ -3,9 +3,11 @@ Data models for Student Risk Dashboard.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Union
 from pydantic import BaseModel, Field
 
+from app.config import STUDENT_LOOKUP_MAX_IDS
+
 
 class StudentRiskPrediction(BaseModel):
     """Student risk prediction response."""
@@ -19,6 +21,17 @@ class StudentRiskPrediction(BaseModel):
     email: Optional[str] = None
 
 
+class StudentLookupRequest(BaseModel):
+    """Request for several students by ID."""
+    student_ids: List[Union[str, int]] = Field(..., max_length=STUDENT_LOOKUP_MAX_IDS)
+
+
+class StudentLookupResponse(BaseModel):
+    """Students found by a lookup, in request order, plus the IDs that were not."""
+    students: List[StudentRiskPrediction]
+    not_found: List[str]
+
+
 class ExcelUploadResponse(BaseModel):
     """Response for Excel upload."""
     message: str
@@ -27,5 +40,53 @@ class ExcelUploadResponse(BaseModel):
     safe_count: int
     avg_grade: float
     avg_attendance: float
+    imputed_grades_by_program: Dict[str, int] = Field(default_factory=dict)
     timestamp: datetime
 
+
+class RiskSummary(BaseModel):
+    """Counts and averages over all students."""
+    total_students: int
+    high_risk_count: int
+    # High Risk plus At Risk, like ExcelUploadResponse.at_risk_count
+    at_risk_count: int
+    safe_count: int
+    avg_grade: Optional[float] = None
+    avg_attendance: Optional[float] = None
+
+
+class ProgramSummary(BaseModel):
+    """Counts and averages for one program, with its students per risk label."""
+    program: str
+    total_students: int
+    avg_grade: Optional[float] = None
+    avg_attendance: Optional[float] = None
+    risk_counts: Dict[str, int]
+
+
+class JobStage(BaseModel):
+    """Progress of one processing stage of an upload job."""
+    name: str
+    status: str
+    started_at: Optional[datetime] = None
+    elapsed_seconds: Optional[float] = None
+
+
+class JobStatus(BaseModel):
+    """Status of a background upload job."""
+    job_id: str
+    filename: str
+    status: str
+    stage: Optional[str] = None
+    stages: List[JobStage]
+    created_at: datetime
+    elapsed_seconds: float
+    result: Optional[ExcelUploadResponse] = None
+    error: Optional[str] = None
+
+
+class JobAccepted(BaseModel):
+    """Response for an upload accepted for background processing."""
+    job_id: str
+    status: str
+    status_url: str
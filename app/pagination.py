@@ -0,0 +1,85 @@
+"""
+Parameters for paged /results requests: sort keys, field projection and
+opaque cursors.
+"""
+
+import base64
+import binascii
+from typing import List, NamedTuple, Optional, Tuple
+
+import orjson
+
+from app.serialization import RESULT_FIELDS
+
+# sort parameter -> results column ('risk' is the display order)
+SORT_COLUMNS = {
+    'risk': 'risk_label',
+    'grade': 'grade',
+    'attendance': 'attendance_rate',
+    'name': 'student_name',
+}
+DEFAULT_SORT = 'risk'
+
+
+class PageCursor(NamedTuple):
+    """Where the next page of a paged /results listing starts."""
+    sort: str
+    at_risk_only: bool
+    offset: int
+
+
+def parse_sort(sort: str) -> Tuple[str, bool]:
+    """
+    Split a sort parameter such as 'grade' or '-grade' into (key, descending).
+
+    Raises:
+        ValueError: If the key is not one of SORT_COLUMNS
+    """
+    descending = sort.startswith('-')
+    key = sort[1:] if descending else sort
+    if key not in SORT_COLUMNS:
+        raise ValueError(f"Invalid sort '{sort}'. Use one of: {', '.join(SORT_COLUMNS)}")
+    return key, descending
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """
+    Parse a comma-separated field projection (None selects every field).
+
+    Raises:
+        ValueError: If a field is not part of the results schema
+    """
+    if fields is None:
+        return RESULT_FIELDS
+    selected = list(dict.fromkeys(name.strip() for name in fields.split(',') if name.strip()))
+    unknown = [name for name in selected if name not in RESULT_FIELDS]
+    if unknown or not selected:
+        raise ValueError(f"Invalid fields '{fields}'. Use any of: {', '.join(RESULT_FIELDS)}")
+    return selected
+
+
+def encode_cursor(version: str, cursor: PageCursor) -> str:
+    """Encode a cursor tied to one version of the dataset."""
+    payload = orjson.dumps([version, *cursor])
+    return base64.urlsafe_b64encode(payload).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(token: str, version: str) -> PageCursor:
+    """
+    Decode a cursor issued by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed or the dataset has changed since
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        cursor_version, sort, at_risk_only, offset = orjson.loads(base64.urlsafe_b64decode(padded))
+        cursor = PageCursor(str(sort), bool(at_risk_only), int(offset))
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if cursor_version != version:
+        raise ValueError("Cursor has expired; results were updated. Start again without a cursor.")
+    if cursor.offset < 0:
+        raise ValueError("Invalid cursor")
+    parse_sort(cursor.sort)
+    return cursor
@@ -0,0 +1,178 @@
+"""
+Run CPU-bound upload processing in a process pool, off the event loop.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException, Request
+
+from utils.data_preprocessing import STAGE_PERSISTING, report_progress
+from utils.file_formats import process_data_file
+from utils.result_files import write_results
+from utils.streaming_ingest import process_excel_file_streaming
+
+logger = logging.getLogger(__name__)
+
+# How often a waiting upload collects progress and checks its client
+POLL_SECONDS = 0.25
+
+
+def process_upload(
+    file_path: str,
+    output_path: str,
+    streaming: bool,
+    chunk_size: int,
+    progress_queue=None
+) -> Dict:
+    """
+    Process an uploaded file and write its results CSV (runs in a worker).
+
+    Args:
+        file_path: Uploaded file
+        output_path: Where to write the results (.csv or .parquet)
+        streaming: Use the bounded-memory streaming reader (.xlsx only)
+        chunk_size: Rows per chunk in streaming mode
+        progress_queue: Optional queue receiving (stage, timestamp) tuples
+
+    Returns:
+        Statistics dictionary
+    """
+    progress = None
+    if progress_queue is not None:
+        def progress(stage: str) -> None:
+            progress_queue.put((stage, time.time()))
+
+    if streaming:
+        return process_excel_file_streaming(Path(file_path), Path(output_path), chunk_size, progress)
+
+    df, stats = process_data_file(Path(file_path), progress)
+    report_progress(progress, STAGE_PERSISTING)
+    write_results(df, Path(output_path))
+    return stats
+
+
+def _drain_progress(progress_queue, on_progress: Callable[[str, float], None]) -> None:
+    """Forward all queued progress events to on_progress."""
+    while True:
+        try:
+            stage, timestamp = progress_queue.get_nowait()
+        except queue.Empty:
+            return
+        on_progress(stage, timestamp)
+
+
+class ClientDisconnected(Exception):
+    """The client went away before processing finished."""
+
+
+class UploadProcessor:
+    """Process pool for uploads with a bounded number of queued jobs."""
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._pending = 0
+
+    @property
+    def busy(self) -> bool:
+        """True when no more uploads may be queued."""
+        return self._pending >= self.max_pending
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            logger.info(f"Started upload process pool with {self.max_workers} workers")
+        return self._executor
+
+    def _progress_queue(self):
+        """A queue worker processes can report progress through."""
+        if self._manager is None:
+            self._manager = multiprocessing.Manager()
+        return self._manager.Queue()
+
+    def shutdown(self) -> None:
+        """Stop the pool, cancelling jobs that have not started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    async def run(
+        self,
+        file_path: Path,
+        output_path: Path,
+        streaming: bool,
+        chunk_size: int,
+        request: Optional[Request] = None,
+        on_progress: Optional[Callable[[str, float], None]] = None
+    ) -> Dict:
+        """
+        Process an upload in the pool, writing results to output_path.
+
+        Results are written to a temporary file and moved into place only
+        when processing completes, so a cancelled job never publishes.
+        on_progress is called with (stage, timestamp) as stages start.
+
+        Raises:
+            HTTPException: 503 if too many uploads are already queued
+            ClientDisconnected: If the client disconnects while waiting
+        """
+        if self.busy:
+            raise HTTPException(
+                status_code=503, detail="Too many uploads in progress. Please retry shortly."
+            )
+
+        # Hidden temp name that keeps the suffix, which selects the format
+        tmp_output = output_path.with_name(f".{uuid.uuid4().hex}.{output_path.name}")
+        future = None
+        self._pending += 1
+        try:
+            progress_queue = self._progress_queue() if on_progress is not None else None
+            future = self.executor.submit(
+                process_upload, str(file_path), str(tmp_output), streaming, chunk_size,
+                progress_queue
+            )
+            waiter = asyncio.wrap_future(future)
+            while True:
+                done, _ = await asyncio.wait({waiter}, timeout=POLL_SECONDS)
+                if progress_queue is not None:
+                    _drain_progress(progress_queue, on_progress)
+                if done:
+                    break
+                if request is not None and await request.is_disconnected():
+                    raise ClientDisconnected()
+
+            stats = waiter.result()
+            os.replace(tmp_output, output_path)
+            return stats
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool next time
+            self._executor = None
+            tmp_output.unlink(missing_ok=True)
+            raise
+        except BaseException:
+            if future is not None and not future.done():
+                # Not started: dropped from the queue. Already running: the
+                # worker finishes in the background and its output is removed.
+                future.cancel()
+                future.add_done_callback(lambda _: tmp_output.unlink(missing_ok=True))
+            else:
+                tmp_output.unlink(missing_ok=True)
+            raise
+        finally:
+            self._pending -= 1
@@ -0,0 +1,114 @@
+"""
+Content-addressed cache of processed uploads.
+
+Entries are keyed by a hash of the upload bytes plus the scoring-rule
+version, so re-uploading an identical file skips parsing and scoring.
+The cache lives on disk and is trimmed least-recently-used first.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils.data_preprocessing import SCORING_VERSION
+
+logger = logging.getLogger(__name__)
+
+RESULTS_FILE = "results.csv"
+STATS_FILE = "stats.json"
+
+
+def upload_hasher():
+    """Return a hashlib object pre-seeded with the scoring-rule version."""
+    hasher = hashlib.sha256()
+    hasher.update(f"scoring-v{SCORING_VERSION}\0".encode())
+    return hasher
+
+
+def copy_atomic(source: Path, target: Path) -> None:
+    """Copy a file so readers of target never see a partial write."""
+    tmp_path = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+    shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, target)
+
+
+class ResultCache:
+    """Size-bounded, on-disk LRU cache of processed results and stats."""
+
+    def __init__(self, cache_dir: Path, max_bytes: int, results_file: str = RESULTS_FILE):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        # Entries hold the results in this file (its suffix sets the format)
+        self.results_file = results_file
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return cached stats for key (marking it recently used), or None."""
+        if not self.enabled:
+            return None
+        entry = self._entry_dir(key)
+        stats_path = entry / STATS_FILE
+        if not stats_path.exists() or not (entry / self.results_file).exists():
+            return None
+        try:
+            stats = json.loads(stats_path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        os.utime(stats_path)
+        return stats
+
+    def activate(self, key: str, output_path: Path) -> None:
+        """Publish the cached results for key as the active results file."""
+        copy_atomic(self._entry_dir(key) / self.results_file, output_path)
+
+    def put(self, key: str, results_path: Path, stats: Dict) -> None:
+        """Store a results file and its stats, then evict down to max_bytes."""
+        if not self.enabled:
+            return
+        entry = self._entry_dir(key)
+        # Unique, so server processes caching the same upload never share it
+        tmp_entry = self.cache_dir / f".{key}.{uuid.uuid4().hex}.tmp"
+        try:
+            tmp_entry.mkdir(parents=True)
+            shutil.copyfile(results_path, tmp_entry / self.results_file)
+            (tmp_entry / STATS_FILE).write_text(json.dumps(stats))
+
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp_entry, entry)
+            self.evict()
+        except OSError as e:
+            # The cache is an optimization; never fail the upload over it
+            logger.warning(f"Could not cache result {key}: {e}")
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+
+    def evict(self) -> None:
+        """Remove least-recently-used entries until the cache fits max_bytes."""
+        entries = []
+        total = 0
+        for entry in self.cache_dir.iterdir():
+            stats_path = entry / STATS_FILE
+            if entry.name.startswith('.') or not stats_path.exists():
+                continue
+            size = sum(f.stat().st_size for f in entry.iterdir())
+            entries.append((stats_path.stat().st_mtime, size, entry))
+            total += size
+
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            logger.info(f"Evicted cached result {entry.name}")
@@ -0,0 +1,109 @@
+"""
+Encode results frames straight to JSON bytes.
+
+Columns are converted once with vectorized casts and handed to orjson,
+instead of building a StudentRiskPrediction per row. The output matches
+the StudentRiskPrediction schema field for field.
+"""
+
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import orjson
+import pandas as pd
+
+from app.compression import SUPPORTED_ENCODINGS, compress
+from app.models import StudentRiskPrediction
+
+# Field order of the /results objects
+RESULT_FIELDS = list(StudentRiskPrediction.model_fields)
+
+# Rows encoded per chunk of a streamed NDJSON response
+NDJSON_BATCH_ROWS = 5_000
+
+
+class RenderedResults(NamedTuple):
+    """A /results payload, encoded and compressed ahead of time."""
+    body: bytes
+    # Content coding -> compressed body
+    compressed: Dict[str, bytes]
+
+
+def text_values(values: pd.Series) -> pd.Series:
+    """A text column as strings, missing values as 'nan' (as read_csv gives them)."""
+    if isinstance(values.dtype, pd.ArrowDtype):
+        # Arrow-backed columns (shared datasets) hold missing values as NA
+        values = pd.Series(values.to_numpy(dtype=object, na_value=np.nan), index=values.index)
+    return values.astype(str)
+
+
+def _text_column(frame: pd.DataFrame, column: str, default: Optional[str] = None) -> List[str]:
+    """A column as Python strings, or default for every row if it is missing."""
+    if default is not None and column not in frame:
+        return [default] * len(frame)
+    return text_values(frame[column]).tolist()
+
+
+def _float_column(frame: pd.DataFrame, column: str) -> List[float]:
+    return frame[column].astype(float).tolist()
+
+
+# Field -> builder of its value list from a results frame
+_COLUMN_BUILDERS = {
+    'student_id': lambda frame: _text_column(frame, 'student_id'),
+    'student_name': lambda frame: _text_column(frame, 'student_name'),
+    'program': lambda frame: _text_column(frame, 'program', 'Unknown'),
+    'grade': lambda frame: _float_column(frame, 'grade'),
+    'attendance_rate': lambda frame: _float_column(frame, 'attendance_rate'),
+    'risk_label': lambda frame: _text_column(frame, 'risk_label'),
+    'recommended_action': lambda frame: _text_column(frame, 'recommended_action'),
+    'email': lambda frame: _text_column(frame, 'email', ''),
+}
+
+
+def result_columns(frame: pd.DataFrame, fields: Sequence[str] = RESULT_FIELDS) -> List[list]:
+    """Per-field value lists for a results frame, in the order of fields."""
+    return [_COLUMN_BUILDERS[field](frame) for field in fields]
+
+
+def result_records(frame: pd.DataFrame, fields: Sequence[str] = RESULT_FIELDS) -> List[dict]:
+    """A results frame as StudentRiskPrediction-shaped dicts."""
+    columns = result_columns(frame, fields)
+    return [dict(zip(fields, values)) for values in zip(*columns)]
+
+
+def encode_results(frame: pd.DataFrame, fields: Sequence[str] = RESULT_FIELDS) -> bytes:
+    """
+    Serialize a results frame as a JSON array of student objects.
+
+    Args:
+        frame: Results frame (as written by the upload pipeline)
+        fields: Fields to include in each object (defaults to the full schema)
+
+    Returns:
+        UTF-8 JSON bytes; NaN values are encoded as null
+    """
+    return orjson.dumps(result_records(frame, fields))
+
+
+def render_results(frame: pd.DataFrame) -> RenderedResults:
+    """Encode a results frame and compress it with every supported coding."""
+    body = encode_results(frame)
+    return RenderedResults(body, {encoding: compress(body, encoding) for encoding in SUPPORTED_ENCODINGS})
+
+
+def iter_ndjson(
+    frame: pd.DataFrame,
+    positions: Sequence[int],
+    fields: Sequence[str] = RESULT_FIELDS,
+    batch_rows: int = NDJSON_BATCH_ROWS
+) -> Iterator[bytes]:
+    """
+    Yield rows of a results frame as newline-delimited JSON, a batch at a time.
+
+    Only one batch is encoded at once, so memory stays flat however many
+    rows are streamed.
+    """
+    for start in range(0, len(positions), batch_rows):
+        records = result_records(frame.iloc[positions[start:start + batch_rows]], fields)
+        yield b"".join(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE) for record in records)
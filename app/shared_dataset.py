@@ -0,0 +1,263 @@
+"""
+Datasets shared between server processes through memory-mapped files.
+
+With several uvicorn workers, each would otherwise read the store and keep
+its own copy of every column. Instead, the first worker to see a new
+version writes it once as a bundle: the sorted results as an uncompressed
+Arrow IPC file, a student ID index, and the rendered /results payloads.
+Every worker then maps the bundle zero-copy, so memory stays flat as
+workers are added and a new worker is ready as soon as the files are
+mapped. The payloads are mapped too and shared through the page cache.
+
+Everything a worker serves is mapped when it loads the bundle, so a
+worker still serving an old version keeps working after another worker
+has collected that bundle's files.
+"""
+
+import logging
+import mmap
+import os
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, NamedTuple, Optional
+
+import numpy as np
+import orjson
+import pandas as pd
+import pyarrow as pa
+
+from app.dataset import AT_RISK_LABELS, Dataset, DatasetCache
+from app.serialization import text_values
+from app.store import ResultStore
+from utils.result_files import results_table
+
+try:
+    import fcntl
+except ImportError:
+    # Not on Windows: concurrent workers may then build the same bundle
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+RESULTS_FILE = "results.arrow"
+INDEX_FILE = "index.arrow"
+LOCK_FILE = ".build.lock"
+META_FILE = "meta.json"
+SUMMARY_FILE = "summary.json"
+PROGRAMS_FILE = "programs.json"
+
+# /results payload file names, keyed by at_risk_only
+PAYLOAD_FILES = {False: "results.json", True: "at_risk.json"}
+
+# Bundles no worker has mapped for this long are removed; a worker still
+# serving one keeps its mappings (an unlinked file lives on while mapped)
+BUNDLE_GRACE_SECONDS = 60
+
+# Bytes per chunk when streaming a mapped payload
+PAYLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class MappedPayload(NamedTuple):
+    """A /results payload mapped from a bundle, like RenderedResults."""
+    body: mmap.mmap
+    # Content coding -> compressed body
+    compressed: Dict[str, mmap.mmap]
+
+
+def _hash_ids(ids) -> np.ndarray:
+    """Stable 64-bit hashes of student IDs (the same in every process)."""
+    return pd.util.hash_array(np.asarray(ids, dtype=object))
+
+
+def _write_ipc(table: pa.Table, path: Path) -> None:
+    # Uncompressed, so readers can map the buffers as they are
+    with pa.OSFile(str(path), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _map_ipc(path: Path) -> pa.Table:
+    return pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+
+
+def _map_file(path: Path) -> mmap.mmap:
+    with open(path, 'rb') as file:
+        # The mapping stays valid after the file is closed (or unlinked)
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def iter_payload(payload: mmap.mmap, chunk_size: int = PAYLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+    """A mapped payload in chunks, for a streamed response."""
+    for start in range(0, len(payload), chunk_size):
+        yield payload[start:start + chunk_size]
+
+
+class SharedDataset(Dataset):
+    """A Dataset backed by a memory-mapped bundle instead of its own copy."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        meta = orjson.loads((self.path / META_FILE).read_bytes())
+        self.version = meta['version']
+        self.updated_at = meta['updated_at']
+        self.last_modified = meta['last_modified']
+        self.risk_counts: Dict[str, int] = meta['risk_counts']
+
+        # Arrow-backed columns point into the mapped file: no per-process copy
+        self.frame = _map_ipc(self.path / RESULTS_FILE).to_pandas(types_mapper=pd.ArrowDtype)
+        self._at_risk_mask = (
+            self.frame['risk_label'].isin(AT_RISK_LABELS).to_numpy(dtype=bool, na_value=False)
+        )
+        index = _map_ipc(self.path / INDEX_FILE)
+        self._id_hashes = index.column('id_hash').to_numpy()
+        self._id_positions = index.column('position').to_numpy()
+
+        self._orders = {}
+        self.summary_json = (self.path / SUMMARY_FILE).read_bytes()
+        self.programs_json = (self.path / PROGRAMS_FILE).read_bytes()
+        self._rendered = {
+            at_risk_only: MappedPayload(
+                _map_file(self.path / name),
+                {encoding: _map_file(self.path / f"{name}.{encoding}") for encoding in meta['encodings']},
+            )
+            for at_risk_only, name in PAYLOAD_FILES.items()
+        }
+
+    @property
+    def at_risk(self) -> pd.DataFrame:
+        return self.frame[self._at_risk_mask]
+
+    def position(self, student_id: str) -> Optional[int]:
+        """Row position of a student in self.frame, or None if unknown."""
+        target = _hash_ids([student_id])[0]
+        start = np.searchsorted(self._id_hashes, target, side='left')
+        end = np.searchsorted(self._id_hashes, target, side='right')
+        # Positions ascend within a hash, so the first match is the first row
+        for position in self._id_positions[start:end]:
+            if text_values(self.frame['student_id'].iloc[[position]]).iloc[0] == student_id:
+                return int(position)
+        return None
+
+
+class SharedDatasetDirectory:
+    """Dataset bundles, one directory per version."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def path_for(self, version: str) -> Path:
+        return self.root / version
+
+    @contextmanager
+    def build_lock(self) -> Iterator[None]:
+        """Held while building a bundle, so one worker builds and the rest wait."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / LOCK_FILE, 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def publish(self, dataset: Dataset) -> Path:
+        """
+        Write a dataset's bundle, unless another process already has.
+
+        The bundle is built in a temp directory and renamed into place, so
+        readers never see a partial one.
+        """
+        target = self.path_for(dataset.version)
+        if target.exists():
+            return target
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_dir = self.root / f".{dataset.version}.{uuid.uuid4().hex}.tmp"
+        tmp_dir.mkdir()
+        try:
+            _write_ipc(results_table(dataset.frame), tmp_dir / RESULTS_FILE)
+
+            hashes = _hash_ids(text_values(dataset.frame['student_id']).tolist())
+            order = np.argsort(hashes, kind='stable')
+            _write_ipc(
+                pa.table({'id_hash': hashes[order], 'position': order.astype(np.int64)}),
+                tmp_dir / INDEX_FILE,
+            )
+
+            encodings = []
+            for at_risk_only, name in PAYLOAD_FILES.items():
+                rendered = dataset.rendered(at_risk_only)
+                (tmp_dir / name).write_bytes(rendered.body)
+                for encoding, body in rendered.compressed.items():
+                    (tmp_dir / f"{name}.{encoding}").write_bytes(body)
+                encodings = list(rendered.compressed)
+
+            (tmp_dir / SUMMARY_FILE).write_bytes(dataset.summary_json)
+            (tmp_dir / PROGRAMS_FILE).write_bytes(dataset.programs_json)
+            (tmp_dir / META_FILE).write_bytes(orjson.dumps({
+                'version': dataset.version,
+                'updated_at': dataset.updated_at,
+                'last_modified': dataset.last_modified,
+                'risk_counts': {label: int(count) for label, count in dataset.risk_counts.items()},
+                'encodings': encodings,
+            }))
+            try:
+                os.rename(tmp_dir, target)
+            except OSError:
+                # Another worker published the same version first
+                if not target.exists():
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        logger.info(f"Published shared dataset {target}")
+        self.collect_garbage(dataset.version)
+        return target
+
+    def touch(self, version: str) -> None:
+        """Mark a version's bundle as in use (see collect_garbage)."""
+        os.utime(self.path_for(version))
+
+    def collect_garbage(self, current: str) -> None:
+        """Remove bundles other than current that no worker mapped recently."""
+        cutoff = time.time() - BUNDLE_GRACE_SECONDS
+        for path in self.root.iterdir():
+            if path.name == current or path.name.startswith('.'):
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    shutil.rmtree(path)
+                    logger.info(f"Removed old shared dataset {path.name}")
+            except OSError as e:
+                logger.warning(f"Could not remove shared dataset {path.name}: {e}")
+
+
+class SharedDatasetCache(DatasetCache):
+    """DatasetCache that maps shared bundles, building one only when missing."""
+
+    def __init__(self, store: ResultStore, directory: SharedDatasetDirectory):
+        super().__init__(store)
+        self.directory = directory
+
+    def _load(self) -> Optional[Dataset]:
+        """Map the bundle for the stored version (caller holds the lock)."""
+        version = self.store.version()
+        if version is None:
+            self._state = (None, None)
+            return None
+
+        path = self.directory.path_for(version)
+        if not path.exists():
+            with self.directory.build_lock():
+                if not path.exists():
+                    stored = self.store.read()
+                    if stored is None:
+                        self._state = (None, None)
+                        return None
+                    logger.info(f"Building shared dataset version {stored.version}")
+                    built = Dataset(stored.frame, version=stored.version, updated_at=stored.updated_at)
+                    path = self.directory.publish(built)
+
+        logger.info(f"Mapping shared dataset {path}")
+        dataset = SharedDataset(path)
+        self.directory.touch(dataset.version)
+        self._state = (dataset.version, dataset)
+        return dataset
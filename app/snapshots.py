@@ -0,0 +1,131 @@
+"""
+Versioned results snapshots on disk.
+
+Every upload writes its results to its own file, named by version, and
+publishes it by atomically replacing a CURRENT pointer file. Nothing is
+ever rewritten in place, so a reader holding a snapshot path always sees
+complete data. Old snapshots are deleted once no upload in this process
+uses them and none has touched them for a grace period, since uploads in
+other server processes cannot pin them in memory.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # Not on Windows: only uploads in this process are serialized
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+POINTER_FILE = "CURRENT"
+LOCK_FILE = ".publish.lock"
+
+# Snapshots written or used this recently are never collected: another
+# process may have just written one and be waiting to import it
+SNAPSHOT_GRACE_SECONDS = 300
+
+
+class SnapshotDirectory:
+    """Results snapshots in one directory plus a pointer to the current one."""
+
+    def __init__(self, root: Path, suffix: str):
+        self.root = Path(root)
+        self.suffix = suffix
+        # version -> number of uploads still using its file
+        self._pins: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._publish_lock = threading.Lock()
+
+    def initialize(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, version: str) -> Path:
+        """Where the snapshot for version lives."""
+        return self.root / f"{version}{self.suffix}"
+
+    def current_version(self) -> Optional[str]:
+        """The published version, or None before the first publish."""
+        try:
+            return (self.root / POINTER_FILE).read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def current_path(self) -> Optional[Path]:
+        """The published snapshot file, if any."""
+        version = self.current_version()
+        if version is None:
+            return None
+        path = self.path_for(version)
+        return path if path.exists() else None
+
+    @contextmanager
+    def pinned(self, version: str) -> Iterator[Path]:
+        """Keep a version's snapshot from being collected while in use."""
+        path = self.path_for(version)
+        with self._lock:
+            self._pins[version] = self._pins.get(version, 0) + 1
+        try:
+            # Restart the grace period other processes see
+            self.touch(path)
+            yield path
+        finally:
+            with self._lock:
+                self._pins[version] -= 1
+                if not self._pins[version]:
+                    del self._pins[version]
+
+    @staticmethod
+    def touch(path: Path) -> None:
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    @contextmanager
+    def publish_lock(self) -> Iterator[None]:
+        """Held while storing and publishing a snapshot, across server processes."""
+        with self._publish_lock, open(self.root / LOCK_FILE, 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def publish(self, version: str) -> None:
+        """
+        Make version current (atomic pointer swap), then collect old snapshots.
+
+        Call with publish_lock held.
+        """
+        pointer = self.root / POINTER_FILE
+        tmp_pointer = self.root / f".{POINTER_FILE}.{uuid.uuid4().hex}.tmp"
+        tmp_pointer.write_text(version)
+        os.replace(tmp_pointer, pointer)
+        self.collect_garbage()
+
+    def collect_garbage(self) -> None:
+        """Delete snapshots that are not current, pinned or recently used."""
+        current = self.current_version()
+        with self._lock:
+            keep = {current, *self._pins}
+        cutoff = time.time() - SNAPSHOT_GRACE_SECONDS
+        for path in self.root.glob(f"*{self.suffix}"):
+            if path.name.startswith('.'):
+                # Temp file of a snapshot still being written
+                continue
+            version = path.name[:-len(self.suffix)]
+            if version in keep:
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    logger.info(f"Removed old results snapshot {path.name}")
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,190 @@
+"""
+SQLite store for processed results.
+
+Each upload replaces the stored results in a single transaction. The
+database runs in WAL mode, so readers keep seeing the previous results
+until the new ones commit, and a write never blocks them.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import (
+    Column,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    delete,
+    event,
+    insert,
+    select,
+)
+
+from utils.result_files import FLOAT_COLUMNS, TEXT_COLUMNS, read_results
+
+try:
+    import fcntl
+except ImportError:
+    # Not on Windows: start a single worker there
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+metadata = MetaData()
+
+# One row per student, in the order the pipeline produced them
+students = Table(
+    "students",
+    metadata,
+    Column("position", Integer, primary_key=True),
+    Column("student_id", String),
+    Column("student_name", String),
+    Column("program", String),
+    Column("grade", Float),
+    Column("attendance_rate", Float),
+    Column("risk_label", String),
+    Column("recommended_action", String),
+    Column("email", String),
+)
+
+# A single row identifying the stored results; replaced with them
+results_version = Table(
+    "results_version",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("version", String, nullable=False),
+    Column("updated_at", Float, nullable=False),
+)
+
+def _configure_connection(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def _rows(frame: pd.DataFrame) -> List[Tuple]:
+    """Rows of a results frame as insert parameters (missing values as NULL)."""
+    columns = [range(len(frame))]
+    for name in TEXT_COLUMNS:
+        values = frame[name]
+        columns.append(values.astype(str).where(values.notna(), None).tolist())
+    for name in FLOAT_COLUMNS:
+        values = frame[name].astype(float)
+        columns.append(values.astype(object).where(values.notna(), None).tolist())
+    return list(zip(*columns))
+
+
+# Plain DB-API insert: parameter tuples go straight to sqlite3's executemany,
+# skipping SQLAlchemy's per-row parameter processing
+_INSERT_COLUMNS = ["position", *TEXT_COLUMNS, *FLOAT_COLUMNS]
+_INSERT_STUDENTS = (
+    f"INSERT INTO {students.name} ({', '.join(_INSERT_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_INSERT_COLUMNS))})"
+)
+
+
+class StoredResults(NamedTuple):
+    """The stored results with the version they belong to."""
+    version: str
+    updated_at: float
+    frame: pd.DataFrame
+
+
+class ResultStore:
+    """Processed results in a local SQLite database."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.engine = create_engine(f"sqlite:///{self.db_path}")
+        event.listen(self.engine, "connect", _configure_connection)
+        # Kept open for data_version(): the counter is per connection
+        self._watch: Optional[sqlite3.Connection] = None
+        self._watch_lock = threading.Lock()
+
+    def initialize(self) -> None:
+        """
+        Create the database and its tables if they do not exist.
+
+        Server workers start together, and create_all checks for each table
+        before creating it, so the check and the create are held under a
+        lock file to keep two workers from creating the same table.
+        """
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.db_path.with_name(f"{self.db_path.name}.lock"), 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            metadata.create_all(self.engine)
+
+    def data_version(self) -> int:
+        """
+        A counter that changes whenever results are committed by another connection.
+
+        PRAGMA data_version on one kept-open connection costs microseconds
+        (no pool checkout or query), so it can be checked on every request;
+        call version() only when it moves. Commits from other processes
+        count too.
+        """
+        with self._watch_lock:
+            if self._watch is None:
+                self._watch = sqlite3.connect(self.db_path, check_same_thread=False)
+            return self._watch.execute("PRAGMA data_version").fetchone()[0]
+
+    def version(self) -> Optional[str]:
+        """Identifier of the stored results, or None if nothing is stored yet."""
+        with self.engine.connect() as conn:
+            return conn.execute(select(results_version.c.version)).scalar()
+
+    def replace(self, frame: pd.DataFrame, version: Optional[str] = None) -> str:
+        """
+        Replace the stored results with a results frame.
+
+        Args:
+            frame: Results frame (as written by the upload pipeline)
+            version: Identifier for the new results, e.g. a hash of the upload
+                they came from (random if not given)
+
+        Returns:
+            The new version identifier
+        """
+        version = version or uuid.uuid4().hex
+        rows = _rows(frame)
+        with self.engine.begin() as conn:
+            conn.execute(delete(students))
+            if rows:
+                conn.exec_driver_sql(_INSERT_STUDENTS, rows)
+            conn.execute(delete(results_version))
+            conn.execute(insert(results_version).values(id=1, version=version, updated_at=time.time()))
+        logger.info(f"Stored {len(rows)} results in {self.db_path}")
+        return version
+
+    def import_file(self, results_path: Path, version: Optional[str] = None) -> str:
+        """Replace the stored results with a results file (CSV or Parquet)."""
+        return self.replace(read_results(results_path), version)
+
+    def read(self) -> Optional[StoredResults]:
+        """All stored results in pipeline order, or None if nothing is stored yet."""
+        query = select(*[c for c in students.c if c.name != "position"]).order_by(students.c.position)
+        version_query = select(results_version.c.version, results_version.c.updated_at)
+        with self.engine.connect() as conn:
+            while True:
+                current = conn.execute(version_query).first()
+                if current is None:
+                    return None
+                frame = pd.read_sql(query, conn)
+                # A replace may commit between the two queries; read again if so
+                if conn.execute(version_query).first() == current:
+                    break
+        # NULL text reads back as None; use NaN like the CSV reader did
+        frame[TEXT_COLUMNS] = frame[TEXT_COLUMNS].fillna(np.nan)
+        return StoredResults(current.version, current.updated_at, frame)
@@ -0,0 +1,56 @@
+"""
+Aggregates served by /summary and /summary/programs.
+
+Built once per loaded dataset, never per request.
+"""
+
+import math
+from typing import List, Optional
+
+import pandas as pd
+
+from app.models import ProgramSummary, RiskSummary
+
+# Labels every risk_counts mapping includes, even at zero
+RISK_LABELS = ['High Risk', 'At Risk', 'Safe']
+
+
+def _rounded(mean: float) -> Optional[float]:
+    """A mean rounded like the upload response (None if there were no values)."""
+    return None if math.isnan(mean) else round(float(mean), 2)
+
+
+def build_summary(frame: pd.DataFrame) -> RiskSummary:
+    """Risk counts and average grade/attendance for a results frame."""
+    counts = frame['risk_label'].value_counts()
+    return RiskSummary(
+        total_students=len(frame),
+        high_risk_count=int(counts.get('High Risk', 0)),
+        at_risk_count=int(counts.get('At Risk', 0) + counts.get('High Risk', 0)),
+        safe_count=int(counts.get('Safe', 0)),
+        avg_grade=_rounded(frame['grade'].mean()),
+        avg_attendance=_rounded(frame['attendance_rate'].mean()),
+    )
+
+
+def build_program_summaries(frame: pd.DataFrame) -> List[ProgramSummary]:
+    """Per-program counts and averages plus the program x risk-label cross-tab."""
+    # Program names as /results shows them
+    programs = frame['program'].astype(str)
+    labels = frame['risk_label'].astype(str)
+
+    crosstab = pd.crosstab(programs, labels)
+    extra_labels = sorted(set(crosstab.columns) - set(RISK_LABELS))
+    crosstab = crosstab.reindex(columns=RISK_LABELS + extra_labels, fill_value=0)
+    means = frame[['grade', 'attendance_rate']].groupby(programs).mean()
+
+    return [
+        ProgramSummary(
+            program=program,
+            total_students=int(row.sum()),
+            avg_grade=_rounded(means.at[program, 'grade']),
+            avg_attendance=_rounded(means.at[program, 'attendance_rate']),
+            risk_counts={label: int(count) for label, count in row.items()},
+        )
+        for program, row in crosstab.iterrows()
+    ]
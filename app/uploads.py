@@ -0,0 +1,62 @@
+"""
+Stream uploaded files to disk in fixed-size chunks.
+"""
+
+import uuid
+from pathlib import Path
+from typing import NamedTuple
+
+import aiofiles
+from fastapi import HTTPException, UploadFile
+
+from app.result_cache import upload_hasher
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class SavedUpload(NamedTuple):
+    """An upload written to a uniquely named file (with the client's suffix)."""
+    path: Path
+    cache_key: str
+    size: int
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413, detail=f"File too large. Maximum size is {max_bytes // (1024 * 1024)} MB"
+    )
+
+
+async def save_upload(file: UploadFile, target_dir: Path, max_bytes: int) -> SavedUpload:
+    """
+    Write an upload to a temporary file in target_dir, hashing as it streams.
+
+    Only one chunk is held in memory at a time. The file keeps the client
+    filename's suffix, so it can be processed where it is; a unique name
+    means concurrent uploads of the same file never replace each other's
+    input. The caller deletes it when done.
+
+    Raises:
+        HTTPException: 413 as soon as the upload exceeds max_bytes
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise _too_large(max_bytes)
+
+    suffix = Path(file.filename or '').suffix.lower()
+    tmp_path = target_dir / f".upload-{uuid.uuid4().hex}{suffix}"
+    hasher = upload_hasher()
+    size = 0
+    try:
+        async with aiofiles.open(tmp_path, 'wb') as out:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                hasher.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    return SavedUpload(tmp_path, hasher.hexdigest(), size)
+
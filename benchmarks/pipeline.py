@@ -0,0 +1,189 @@
+"""
+Benchmark the upload pipeline end to end on synthetic cohorts.
+
+For each cohort size and file format, times:
+- each pipeline stage (reading, merging, scoring, persisting), in memory
+  and, for .xlsx, in streaming mode;
+- a full POST /upload-excel through the app;
+- /results serialization: the pre-rendered payload, a first sorted page,
+  a full NDJSON stream, and encoding the whole dataset.
+
+Every measurement runs in a fresh process, so its peak memory is its own.
+Input files are generated with benchmarks/synthetic_data.py and reused
+across runs.
+
+Usage:
+    python benchmarks/pipeline.py [students ...] [--formats xlsx,csv,parquet] [--skip-upload]
+"""
+
+import argparse
+import logging
+import os
+import queue
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+from benchmarks.synthetic_data import FORMATS, write_dataset
+from utils.data_preprocessing import PIPELINE_STAGES
+
+try:
+    import resource
+except ImportError:
+    # Windows: timings only
+    resource = None
+
+PROJECT_DIR = Path(__file__).parent.parent
+
+
+def _peak_mb(who: int = 0) -> Optional[float]:
+    """Peak resident memory in MB of this process (or its finished children)."""
+    if resource is None:
+        return None
+    kilobytes = resource.getrusage(resource.RUSAGE_CHILDREN if who else resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS
+    return kilobytes / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def _stage_durations(events: List, end: float) -> Dict[str, float]:
+    """Seconds per stage, from (stage, start timestamp) events."""
+    durations = {}
+    for position, (stage, started) in enumerate(events):
+        finished = events[position + 1][1] if position + 1 < len(events) else end
+        durations[stage] = finished - started
+    return durations
+
+
+def measure_pipeline(path: str, streaming: bool) -> Dict:
+    """Run process_upload in this process and time its stages."""
+    logging.disable(logging.WARNING)
+    from app.config import STREAMING_CHUNK_SIZE
+    from app.processing import process_upload
+
+    baseline = _peak_mb()
+    events = queue.Queue()
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.time()
+        process_upload(path, str(Path(tmp) / 'results.csv'), streaming, STREAMING_CHUNK_SIZE, events)
+        end = time.time()
+
+    return {
+        'stages': _stage_durations(list(events.queue), end),
+        'total': end - start,
+        'baseline_mb': baseline,
+        'peak_mb': _peak_mb(),
+    }
+
+
+def measure_upload(path: str) -> Dict:
+    """Upload a file through the app, then time /results serialization."""
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        # The app keeps data/, db/ and its caches relative to the working directory
+        os.chdir(tmp)
+        os.environ.setdefault('PROCESS_POOL_WORKERS', '1')
+        from fastapi.testclient import TestClient
+
+        from app.main import app, dataset_cache
+        from app.serialization import encode_results
+
+        baseline = _peak_mb()
+        timings = {}
+        with TestClient(app) as client:
+            def timed(name, method, url, **kwargs):
+                start = time.perf_counter()
+                response = client.request(method, url, **kwargs)
+                timings[name] = time.perf_counter() - start
+                if response.status_code != 200:
+                    raise RuntimeError(f"{method} {url}: {response.status_code} {response.text[:200]}")
+                return response
+
+            with open(path, 'rb') as upload:
+                timed('upload', 'POST', '/upload-excel', files={'file': (Path(path).name, upload)})
+            timed('results', 'GET', '/results', headers={'Accept-Encoding': 'identity'})
+            timed('results_br', 'GET', '/results', headers={'Accept-Encoding': 'br, gzip'})
+            timed('sorted_page', 'GET', '/results?sort=name&limit=100')
+            timed('ndjson', 'GET', '/results?format=ndjson', headers={'Accept-Encoding': 'identity'})
+
+            frame = dataset_cache.get().frame
+            start = time.perf_counter()
+            encode_results(frame)
+            timings['encode'] = time.perf_counter() - start
+        server_peak = _peak_mb()
+
+    return {
+        'timings': timings,
+        'baseline_mb': baseline,
+        'peak_mb': server_peak,
+        # The process pool has shut down, so its workers count as finished children
+        'worker_peak_mb': _peak_mb(who=1),
+    }
+
+
+def _isolated(func, *args) -> Dict:
+    """Run func in a fresh process and return its result."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+        return executor.submit(func, *args).result()
+
+
+def _mb(value: Optional[float]) -> str:
+    return f"{value:.0f}" if value is not None else "n/a"
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('students', type=int, nargs='*', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--formats', default=','.join(FORMATS), help="Comma-separated: xlsx, csv, parquet")
+    parser.add_argument('--data', type=Path, default=PROJECT_DIR / 'data' / 'benchmarks',
+                        help="Where synthetic inputs are generated and reused")
+    parser.add_argument('--skip-upload', action='store_true', help="Only time the pipeline stages")
+    args = parser.parse_args(argv)
+    formats = [name.strip() for name in args.formats.split(',') if name.strip()]
+
+    inputs = {}
+    for students in args.students:
+        missing = [name for name in formats if not (args.data / f"students_{students}.{name}").exists()]
+        if missing:
+            print(f"Generating {students} students ({', '.join(missing)})...")
+            write_dataset(args.data, students, missing)
+        for name in formats:
+            inputs[students, name] = args.data / f"students_{students}.{name}"
+
+    stage_header = ''.join(f"{stage + ' (s)':>15}" for stage in PIPELINE_STAGES)
+    print("\nPipeline stages (peak MB includes ~baseline MB of imports)")
+    print(f"{'students':>9} {'format':>8} {'mode':>10}{stage_header} {'total (s)':>10} {'peak MB':>8} {'baseline':>9}")
+    for (students, name), path in inputs.items():
+        modes = [False, True] if name == 'xlsx' else [False]
+        for streaming in modes:
+            result = _isolated(measure_pipeline, str(path), streaming)
+            stages = ''.join(f"{result['stages'].get(stage, 0):>15.3f}" for stage in PIPELINE_STAGES)
+            print(
+                f"{students:>9} {name:>8} {'streaming' if streaming else 'memory':>10}{stages} "
+                f"{result['total']:>10.3f} {_mb(result['peak_mb']):>8} {_mb(result['baseline_mb']):>9}"
+            )
+
+    if args.skip_upload:
+        return
+
+    columns = ['upload', 'results', 'results_br', 'sorted_page', 'ndjson', 'encode']
+    print("\nEnd-to-end upload and /results (seconds; peak MB of server and upload worker)")
+    print(
+        f"{'students':>9} {'format':>8}" + ''.join(f"{column:>13}" for column in columns)
+        + f" {'server MB':>10} {'worker MB':>10}"
+    )
+    for (students, name), path in inputs.items():
+        result = _isolated(measure_upload, str(path.resolve()))
+        timings = ''.join(f"{result['timings'][column]:>13.3f}" for column in columns)
+        print(
+            f"{students:>9} {name:>8}{timings} "
+            f"{_mb(result['peak_mb']):>10} {_mb(result['worker_peak_mb']):>10}"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Benchmark /results serialization: per-row pydantic models vs columnar orjson.
+
+Usage:
+    python benchmarks/results_serialization.py [rows ...]
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+sys.path.append(str(Path(__file__).parent.parent))
+from app.models import StudentRiskPrediction
+from app.serialization import encode_results
+
+PROGRAMS = ["Business Administration", "Computer Programming", "Network Administration"]
+RISK_LABELS = ["High Risk", "At Risk", "Safe"]
+
+_response_adapter = TypeAdapter(List[StudentRiskPrediction])
+
+
+def make_results(rows: int, seed: int = 0) -> pd.DataFrame:
+    """A synthetic results frame shaped like processed_students.csv."""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(5_600_000, 5_600_000 + rows)
+    return pd.DataFrame({
+        'student_id': ids,
+        'student_name': [f"Student {i}" for i in range(rows)],
+        'program': rng.choice(PROGRAMS, rows),
+        'grade': rng.uniform(40, 100, rows).round(2),
+        'attendance_rate': rng.uniform(40, 100, rows).round(2),
+        'risk_label': rng.choice(RISK_LABELS, rows),
+        'recommended_action': "Continue regular progress checks.",
+        'email': [f"student.{i}@college.ca" for i in range(rows)],
+    })
+
+
+def encode_per_row(df: pd.DataFrame) -> bytes:
+    """The previous /results path: iterrows, one model per row, then FastAPI's encoding."""
+    results = []
+    for _, row in df.iterrows():
+        results.append(StudentRiskPrediction(
+            student_id=str(row['student_id']),
+            student_name=str(row['student_name']),
+            program=str(row.get('program', 'Unknown')),
+            grade=float(row['grade']),
+            attendance_rate=float(row['attendance_rate']),
+            risk_label=str(row['risk_label']),
+            recommended_action=str(row['recommended_action']),
+            email=str(row.get('email', ''))
+        ))
+    # response_model validation and serialization, then JSONResponse rendering
+    validated = _response_adapter.validate_python(results)
+    return JSONResponse(_response_adapter.dump_python(validated, mode='json')).body
+
+
+def best_of(func, df: pd.DataFrame, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(sizes: List[int]) -> None:
+    print(f"{'rows':>10} {'per-row (s)':>12} {'columnar (s)':>13} {'speedup':>8}")
+    for rows in sizes:
+        df = make_results(rows)
+        if encode_per_row(df) != encode_results(df):
+            raise SystemExit(f"Output mismatch at {rows} rows")
+        repeat = 3 if rows <= 100_000 else 1
+        per_row = best_of(encode_per_row, df, repeat)
+        columnar = best_of(encode_results, df, repeat)
+        print(f"{rows:>10} {per_row:>12.3f} {columnar:>13.3f} {per_row / columnar:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000])
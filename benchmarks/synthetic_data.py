@@ -0,0 +1,264 @@
+"""
+Generate realistic synthetic student data for benchmarks.
+
+Builds a Grades/Attendance workbook in the layout process_excel_file
+expects, plus the equivalent flat CSV and Parquet exports. The data has:
+- grades as numbers, fractions, percent strings, padded or lower-case
+  letters, unknown codes and blanks;
+- missing names, hours and percentages;
+- duplicate Student# rows, and attendance students missing from grades
+  (and the reverse);
+- many programs of very different sizes, including one with no grades
+  at all.
+
+Usage:
+    python benchmarks/synthetic_data.py [students ...] [--out DIR] [--formats xlsx,csv,parquet]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+FORMATS = ['xlsx', 'csv', 'parquet']
+
+# Rows per worksheet, header included
+EXCEL_MAX_ROWS = 1_048_576
+
+FIRST_NAMES = [
+    "Aaliyah", "Amir", "Ana", "Chen", "Daniel", "Fatima", "Gabriel", "Hannah", "Ibrahim", "Jin",
+    "Kofi", "Laura", "Mateo", "Mei", "Noah", "Olivia", "Priya", "Ravi", "Sara", "Yusuf",
+]
+LAST_NAMES = [
+    "Ahmed", "Brown", "Chen", "Da Silva", "Dubois", "Garcia", "Kim", "Kowalski", "Martin", "Nguyen",
+    "O'Brien", "Okafor", "Patel", "Rossi", "Singh", "Smith", "Tremblay", "Wang", "Wilson", "Zhang",
+]
+SUBJECTS = [
+    "Accounting", "Business Administration", "Computer Programming", "Cybersecurity",
+    "Early Childhood Education", "Electrical Techniques", "Health Care Aide", "Hospitality",
+    "Medical Office Administration", "Network Administration", "Paralegal", "Pharmacy Technician",
+    "Practical Nursing", "Project Management", "Supply Chain", "Web Development",
+]
+CREDENTIALS = ["Certificate", "Diploma", "Advanced Diploma", "Graduate Certificate", "Co-op Diploma"]
+
+# A program whose students never have a grade (exercises the overall-average fallback)
+UNGRADED_PROGRAM = "Academic Upgrading"
+
+LETTER_GRADES = np.array(['A+', 'A', 'A-', 'B+', 'B', 'B-', 'C+', 'C', 'C-', 'D+', 'D', 'D-', 'F'])
+LETTER_CUTOFFS = np.array([97, 93, 90, 87, 83, 80, 77, 73, 70, 67, 63, 60, 0])
+UNKNOWN_GRADES = np.array(['INC', 'W', 'AU', 'IP'])
+
+# Share of grade values written in each format (the rest are blank)
+GRADE_FORMATS = {
+    'number': 0.45,
+    'fraction': 0.10,
+    'percent': 0.15,
+    'letter': 0.15,
+    'unknown': 0.03,
+}
+
+DUPLICATE_RATE = 0.02
+ATTENDANCE_COVERAGE = 0.97
+ATTENDANCE_ONLY_RATE = 0.01
+
+
+def program_names() -> List[str]:
+    """Every subject/credential pair, plus the ungraded program."""
+    return [f"{subject} - {credential}" for subject in SUBJECTS for credential in CREDENTIALS] + [
+        UNGRADED_PROGRAM
+    ]
+
+
+def _with_missing(values: np.ndarray, rate: float, rng: np.random.Generator) -> np.ndarray:
+    values = values.astype(object)
+    values[rng.random(len(values)) < rate] = None
+    return values
+
+
+def _names(count: int, rng: np.random.Generator) -> np.ndarray:
+    first = np.array(FIRST_NAMES, dtype=object)[rng.integers(len(FIRST_NAMES), size=count)]
+    last = np.array(LAST_NAMES, dtype=object)[rng.integers(len(LAST_NAMES), size=count)]
+    return first + ' ' + last
+
+
+def _letter_grades(scores: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    letters = LETTER_GRADES[np.argmax(scores[:, None] >= LETTER_CUTOFFS[None, :], axis=1)].astype(object)
+    # Exports are not always tidy: lower case and stray spaces
+    sloppy = rng.random(len(letters)) < 0.2
+    letters[sloppy] = [f" {letter.lower()} " for letter in letters[sloppy]]
+    return letters
+
+
+def _grades(count: int, rng: np.random.Generator) -> np.ndarray:
+    """Raw grade values in mixed formats."""
+    scores = np.clip(rng.normal(74, 13, count), 0, 100).round(1)
+    formats = list(GRADE_FORMATS)
+    choice = rng.choice(
+        len(formats) + 1, size=count, p=[*GRADE_FORMATS.values(), 1 - sum(GRADE_FORMATS.values())]
+    )
+
+    grades = np.full(count, None, dtype=object)
+    for code, name in enumerate(formats):
+        rows = choice == code
+        if name == 'number':
+            grades[rows] = scores[rows]
+        elif name == 'fraction':
+            grades[rows] = (scores[rows] / 100).round(3)
+        elif name == 'percent':
+            grades[rows] = [f"{score:.1f}%" for score in scores[rows]]
+        elif name == 'letter':
+            grades[rows] = _letter_grades(scores[rows], rng)
+        else:
+            grades[rows] = UNKNOWN_GRADES[rng.integers(len(UNKNOWN_GRADES), size=rows.sum())]
+    return grades
+
+
+def make_student_frames(students: int, seed: int = 0) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Build Grades and Attendance worksheets for a synthetic cohort.
+
+    Args:
+        students: Number of distinct students in the grades sheet
+        seed: Random seed (the same seed gives the same data)
+
+    Returns:
+        Tuple of (grades_df, attendance_df) with the workbook's column names
+    """
+    rng = np.random.default_rng(seed)
+    ids = 5_600_000 + rng.permutation(students * 2)[:students]
+    names = _names(students, rng)
+
+    # Program sizes follow a long tail: a few large programs, many small ones
+    programs = np.array(program_names(), dtype=object)
+    weights = 1 / np.arange(1, len(programs) + 1) ** 0.8
+    program = rng.permutation(programs)[rng.choice(len(programs), size=students, p=weights / weights.sum())]
+
+    grades = _grades(students, rng)
+    grades[program == UNGRADED_PROGRAM] = None
+
+    grades_df = pd.DataFrame({
+        'Student#': ids,
+        'Student Name': _with_missing(names, 0.01, rng),
+        'Program Name': program,
+        'Current Overall Program Grade': grades,
+    })
+
+    # Re-exported rows: the same student again with another grade
+    duplicates = rng.choice(students, size=int(students * DUPLICATE_RATE), replace=False)
+    repeated = grades_df.iloc[duplicates].assign(**{
+        'Current Overall Program Grade': _grades(len(duplicates), rng)
+    })
+    grades_df = pd.concat([grades_df, repeated], ignore_index=True)
+    grades_df = grades_df.iloc[rng.permutation(len(grades_df))].reset_index(drop=True)
+
+    # Attendance covers most graded students plus a few who have no grades yet
+    covered = rng.random(students) < ATTENDANCE_COVERAGE
+    extra = int(students * ATTENDANCE_ONLY_RATE)
+    attendance_ids = np.concatenate([ids[covered], 5_600_000 + students * 2 + np.arange(extra)])
+    attendance_names = np.concatenate([names[covered], _names(extra, rng)])
+    rows = len(attendance_ids)
+
+    scheduled = rng.uniform(40, 400, rows).round(1)
+    scheduled[rng.random(rows) < 0.02] = 0
+    rate = rng.beta(8, 2, rows)
+    attended = (scheduled * rate).round(1)
+    percent = (rate * 100).round(1)
+
+    attendance_df = pd.DataFrame({
+        'Student#': attendance_ids,
+        'Student Name': attendance_names,
+        'Scheduled Hours to Date': _with_missing(scheduled, 0.03, rng),
+        'Attended Hours to Date': _with_missing(attended, 0.05, rng),
+        'Attended % to Date': _with_missing(percent, 0.3, rng),
+    })
+    attendance_df = pd.concat(
+        [attendance_df, attendance_df.sample(frac=DUPLICATE_RATE / 2, random_state=seed)],
+        ignore_index=True,
+    )
+    attendance_df = attendance_df.iloc[rng.permutation(len(attendance_df))].reset_index(drop=True)
+    return grades_df, attendance_df
+
+
+def make_flat_frame(grades_df: pd.DataFrame, attendance_df: pd.DataFrame) -> pd.DataFrame:
+    """One table with grades and attendance columns, as CSV/Parquet exports hold them."""
+    attendance = attendance_df.drop(columns=['Student Name']).drop_duplicates('Student#')
+    return grades_df.merge(attendance, on='Student#', how='left')
+
+
+def write_workbook(path: Path, grades_df: pd.DataFrame, attendance_df: pd.DataFrame) -> None:
+    """
+    Write a Grades/Attendance workbook.
+
+    Uses openpyxl's write-only mode, which streams rows to disk, so even a
+    million-student workbook is written in bounded memory.
+
+    Raises:
+        ValueError: If a sheet would exceed Excel's row limit
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for title, frame in (('Grades', grades_df), ('Attendance', attendance_df)):
+        if len(frame) + 1 > EXCEL_MAX_ROWS:
+            raise ValueError(f"{title} sheet has {len(frame)} rows; Excel allows {EXCEL_MAX_ROWS - 1}")
+        sheet = workbook.create_sheet(title)
+        sheet.append(list(frame.columns))
+        columns = [frame[name].astype(object).where(frame[name].notna(), None).tolist() for name in frame]
+        for row in zip(*columns):
+            sheet.append(row)
+    workbook.save(path)
+
+
+def write_dataset(out_dir: Path, students: int, formats: Sequence[str] = FORMATS, seed: int = 0) -> Dict[str, Path]:
+    """
+    Generate a cohort and write it in each requested format.
+
+    Returns:
+        Format -> written file (students_<n>.<format> in out_dir)
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    grades_df, attendance_df = make_student_frames(students, seed)
+
+    paths = {}
+    for file_format in formats:
+        path = out_dir / f"students_{students}.{file_format}"
+        if file_format == 'xlsx':
+            write_workbook(path, grades_df, attendance_df)
+        else:
+            flat = make_flat_frame(grades_df, attendance_df)
+            if file_format == 'csv':
+                flat.to_csv(path, index=False)
+            elif file_format == 'parquet':
+                # Parquet columns need one type: mixed grades are exported as text
+                grade = flat['Current Overall Program Grade']
+                flat['Current Overall Program Grade'] = grade.astype(str).where(grade.notna(), None)
+                flat.to_parquet(path, index=False)
+            else:
+                raise ValueError(f"Unsupported format: {file_format}")
+        paths[file_format] = path
+    return paths
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('students', type=int, nargs='*', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--out', type=Path, default=Path('data') / 'benchmarks')
+    parser.add_argument('--formats', default=','.join(FORMATS), help="Comma-separated: xlsx, csv, parquet")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    formats = [name.strip() for name in args.formats.split(',') if name.strip()]
+    for students in args.students:
+        start = time.perf_counter()
+        paths = write_dataset(args.out, students, formats, args.seed)
+        written = ', '.join(f"{path.name} ({path.stat().st_size / 1e6:.1f} MB)" for path in paths.values())
+        print(f"{students:>9} students: {written} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
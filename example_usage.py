@@ -121,7 +121,7 @@ def example_get_programs():
     print("\n📚 Example: Fetching program summaries...")
     
     try:
-        response = requests.get(f"{BASE_URL}/programs")
+        response = requests.get(f"{BASE_URL}/summary/programs")
         print_response("Program Summaries", response.json())
     except requests.exceptions.ConnectionError:
         print("❌ Connection error. Make sure the API server is running.")
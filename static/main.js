@@ -53,10 +53,14 @@ form.addEventListener('submit', async (e) => {
     }
 });
 
+// Top of the risk-sorted list, with only the fields the table shows
+const TABLE_ROWS = 10;
+const TABLE_FIELDS = 'student_name,program,grade,attendance_rate,risk_label,recommended_action,email';
+
 // Load results
 async function loadResults() {
     try {
-        const response = await fetch(`${API_BASE}/results`);
+        const response = await fetch(`${API_BASE}/results?limit=${TABLE_ROWS}&fields=${TABLE_FIELDS}`);
         if (!response.ok) {
             if (response.status === 404) return;
             throw new Error('Failed to load results');
@@ -65,30 +69,32 @@ async function loadResults() {
         const students = await response.json();
         if (students.length === 0) return;
         
-        displayResults(students);
+        // Totals come from headers; the page only holds the table rows
+        const summary = {
+            total: response.headers.get('X-Student-Count'),
+            highRisk: response.headers.get('X-High-Risk-Count'),
+            atRisk: response.headers.get('X-At-Risk-Count'),
+            safe: response.headers.get('X-Safe-Count')
+        };
+        
+        displayResults(students, summary);
     } catch (error) {
         console.error('Error:', error);
     }
 }
 
 // Display results
-function displayResults(students) {
+function displayResults(students, summary) {
     // Summary
-    const total = students.length;
-    const highRisk = students.filter(s => s.risk_label === 'High Risk').length;
-    const atRisk = students.filter(s => s.risk_label === 'At Risk').length;
-    const safe = students.filter(s => s.risk_label === 'Safe').length;
-    
-    document.getElementById('totalStudents').textContent = total;
-    document.getElementById('highRiskCount').textContent = highRisk;
-    document.getElementById('mediumRiskCount').textContent = atRisk;
-    document.getElementById('lowRiskCount').textContent = safe;
+    document.getElementById('totalStudents').textContent = summary.total;
+    document.getElementById('highRiskCount').textContent = summary.highRisk;
+    document.getElementById('mediumRiskCount').textContent = summary.atRisk;
+    document.getElementById('lowRiskCount').textContent = summary.safe;
     
-    // Table - show top 10
-    const top10 = students.slice(0, 10);
+    // Table - top 10 by risk
     tableBody.innerHTML = '';
     
-    top10.forEach(student => {
+    students.forEach(student => {
         const row = document.createElement('tr');
         const riskClass = student.risk_label === 'High Risk' ? 'high' :
                          student.risk_label === 'At Risk' ? 'medium' : 'low';
@@ -96,8 +102,8 @@ function displayResults(students) {
         row.innerHTML = `
             <td><strong>${escapeHtml(student.student_name)}</strong></td>
             <td>${escapeHtml(student.program || 'N/A')}</td>
-            <td>${student.grade.toFixed(1)}%</td>
-            <td>${student.attendance_rate.toFixed(1)}%</td>
+            <td>${formatPercent(student.grade)}</td>
+            <td>${formatPercent(student.attendance_rate)}</td>
             <td><span class="risk-badge ${riskClass}">${escapeHtml(student.risk_label)}</span></td>
             <td>${escapeHtml(student.recommended_action)}</td>
             <td><a href="mailto:${student.email}" class="email-link">${escapeHtml(student.email || '')}</a></td>
@@ -117,6 +123,11 @@ function showMessage(type, text) {
     }
 }
 
+// Missing grades and attendance arrive as null
+function formatPercent(value) {
+    return value == null ? 'N/A' : `${value.toFixed(1)}%`;
+}
+
 function escapeHtml(text) {
     const div = document.createElement('div');
     div.textContent = text;
@@ -0,0 +1,55 @@
+"""
+Shared fixtures: a small synthetic cohort built with the benchmark generator,
+and an app client serving it.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from benchmarks.synthetic_data import make_student_frames, write_workbook
+
+COHORT_SIZE = 400
+
+
+@pytest.fixture(scope="session")
+def cohort_frames():
+    """Grades and Attendance sheets with duplicates and attendance-only students."""
+    return make_student_frames(COHORT_SIZE, seed=7)
+
+
+@pytest.fixture(scope="session")
+def cohort_workbook(tmp_path_factory, cohort_frames) -> Path:
+    """The cohort as a Grades/Attendance workbook."""
+    path = tmp_path_factory.mktemp("cohort") / "students.xlsx"
+    write_workbook(path, *cohort_frames)
+    return path
+
+
+@pytest.fixture(scope="session")
+def client(tmp_path_factory, cohort_workbook):
+    """App client with the cohort uploaded, run in a scratch directory."""
+    # data/ and db/ are relative to the working directory
+    workdir = tmp_path_factory.mktemp("app")
+    previous = os.getcwd()
+    os.chdir(workdir)
+    os.environ.setdefault("PROCESS_POOL_WORKERS", "1")
+    try:
+        from fastapi.testclient import TestClient
+
+        from app.main import app
+
+        with TestClient(app) as client:
+            with open(cohort_workbook, 'rb') as upload:
+                response = client.post('/upload-excel', files={'file': ('students.xlsx', upload)})
+            assert response.status_code == 200, response.text
+            yield client
+    finally:
+        os.chdir(previous)
+
+
+@pytest.fixture(scope="session")
+def results(client):
+    """The full /results listing."""
+    return client.get('/results').json()
@@ -0,0 +1,58 @@
+"""
+Columnar attendance rates against the original per-row calculation.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.data_preprocessing import calculate_attendance_rate
+
+
+def row_attendance_rate(row: pd.Series, columns) -> float:
+    """The per-row rule calculate_attendance_rate replaced."""
+    if 'Attended % to Date' in columns and pd.notna(row.get('Attended % to Date')):
+        try:
+            return float(row['Attended % to Date'])
+        except (ValueError, TypeError):
+            pass
+    attended = row.get('Attended Hours to Date', 0)
+    scheduled = row.get('Scheduled Hours to Date', 0)
+    try:
+        attended = float(attended) if pd.notna(attended) else 0
+        scheduled = float(scheduled) if pd.notna(scheduled) else 0
+        if scheduled > 0:
+            return (attended / scheduled) * 100
+    except (ValueError, TypeError):
+        pass
+    return np.nan
+
+
+def expected_rates(df: pd.DataFrame) -> np.ndarray:
+    return np.array([row_attendance_rate(row, df.columns) for _, row in df.iterrows()], dtype=float)
+
+
+def test_matches_per_row_rule():
+    df = pd.DataFrame({
+        'Attended % to Date': [92.5, None, "88", "n/a", None, None, None, None],
+        'Attended Hours to Date': [10, 45, 10, 30, None, 20, "absent", 5],
+        'Scheduled Hours to Date': [20, 50, 20, 40, 40, 0, 40, None],
+    }, dtype=object)
+
+    rates = calculate_attendance_rate(df)
+
+    np.testing.assert_allclose(rates.to_numpy(), expected_rates(df), equal_nan=True)
+    np.testing.assert_allclose(
+        rates.to_numpy(), [92.5, 90.0, 88.0, 75.0, 0.0, np.nan, np.nan, np.nan], equal_nan=True
+    )
+
+
+def test_hours_only():
+    df = pd.DataFrame({'Attended Hours to Date': [30.0, 0.0], 'Scheduled Hours to Date': [40.0, 40.0]})
+    np.testing.assert_allclose(calculate_attendance_rate(df).to_numpy(), expected_rates(df))
+
+
+def test_no_attendance_columns():
+    df = pd.DataFrame({'Student#': [1, 2]}, index=[5, 6])
+    rates = calculate_attendance_rate(df)
+    assert list(rates.index) == [5, 6]
+    assert rates.isna().all()
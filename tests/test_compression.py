@@ -0,0 +1,59 @@
+"""
+Compressed /results payloads and NDJSON streaming.
+"""
+
+import orjson
+import pytest
+
+from app.compression import BROTLI, GZIP, SUPPORTED_ENCODINGS, preferred_encoding
+
+
+@pytest.mark.parametrize("header, available, expected", [
+    ("gzip, br", [BROTLI, GZIP], BROTLI),
+    ("gzip;q=0.5, br;q=0.4", [BROTLI, GZIP], GZIP),
+    ("br", [GZIP], None),
+    ("*", [BROTLI, GZIP], BROTLI),
+    ("gzip;q=0", [GZIP], None),
+    ("identity", [BROTLI, GZIP], None),
+    ("", [GZIP], None),
+])
+def test_preferred_encoding(header, available, expected):
+    assert preferred_encoding(header, available) == expected
+
+
+@pytest.mark.parametrize("encoding", SUPPORTED_ENCODINGS)
+@pytest.mark.parametrize("url", ["/results", "/results?at_risk_only=true", "/results?sort=-grade"])
+def test_compressed_results(client, url, encoding):
+    plain = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+    # The client decodes the body, so it must equal the plain one
+    compressed = client.get(url, headers={"Accept-Encoding": encoding})
+    assert compressed.headers["content-encoding"] == encoding
+    assert "Accept-Encoding" in compressed.headers["vary"]
+    assert compressed.json() == plain.json()
+
+
+@pytest.mark.parametrize("encoding", ["identity", GZIP])
+def test_ndjson_matches_json(client, encoding):
+    listing = client.get("/results?sort=name&at_risk_only=true").json()
+
+    response = client.get(
+        "/results?format=ndjson&sort=name&at_risk_only=true", headers={"Accept-Encoding": encoding}
+    )
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.content.splitlines()
+    assert [orjson.loads(line) for line in lines] == listing
+    assert response.headers["x-total-count"] == str(len(listing))
+
+
+def test_ndjson_projection(client):
+    response = client.get("/results?format=ndjson&limit=5&fields=student_id,risk_label")
+    rows = [orjson.loads(line) for line in response.content.splitlines()]
+    assert len(rows) == 5
+    assert all(set(row) == {"student_id", "risk_label"} for row in rows)
+
+
+def test_invalid_format(client):
+    assert client.get("/results?format=xml").status_code == 400
@@ -0,0 +1,57 @@
+"""
+ETag / Last-Modified validators and 304 responses.
+"""
+
+import pytest
+
+ENDPOINTS = ["/results", "/results?limit=10&sort=name", "/summary", "/summary/programs"]
+
+
+@pytest.mark.parametrize("url", ENDPOINTS)
+def test_validators_and_304(client, url):
+    response = client.get(url)
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+    assert response.headers["last-modified"]
+
+    cached = client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+
+def test_student_etag_matches_dataset(client, results):
+    etag = client.get("/results").headers["etag"]
+    response = client.get(f"/students/{results[0]['student_id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize("tag, modified", [
+    ('W/"other"', True),
+    ('"other", {etag}', False),
+    # Weak comparison: the strong form matches too
+    ('{strong}', False),
+    ("*", False),
+])
+def test_if_none_match(client, tag, modified):
+    etag = client.get("/summary").headers["etag"]
+    header = tag.format(etag=etag, strong=etag[2:])
+    response = client.get("/summary", headers={"If-None-Match": header})
+    assert response.status_code == (200 if modified else 304)
+
+
+def test_if_modified_since(client):
+    last_modified = client.get("/summary").headers["last-modified"]
+
+    assert client.get("/summary", headers={"If-Modified-Since": last_modified}).status_code == 304
+    old = "Mon, 01 Jan 2001 00:00:00 GMT"
+    assert client.get("/summary", headers={"If-Modified-Since": old}).status_code == 200
+    assert client.get("/summary", headers={"If-Modified-Since": "not a date"}).status_code == 200
+
+
+def test_if_none_match_takes_precedence(client):
+    last_modified = client.get("/summary").headers["last-modified"]
+    response = client.get(
+        "/summary", headers={"If-None-Match": 'W/"other"', "If-Modified-Since": last_modified}
+    )
+    assert response.status_code == 200
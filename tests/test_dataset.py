@@ -0,0 +1,76 @@
+"""
+Dataset ordering and the non-blocking DatasetCache.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.dataset import Dataset, DatasetCache
+from app.store import StoredResults
+
+
+def _frame(names, grades=None) -> pd.DataFrame:
+    count = len(names)
+    return pd.DataFrame({
+        'student_id': [str(number) for number in range(count)],
+        'student_name': names,
+        'program': 'Nursing',
+        'grade': grades if grades is not None else np.linspace(50, 90, count),
+        'attendance_rate': 80.0,
+        'risk_label': 'Safe',
+        'recommended_action': 'None',
+        'email': 'student@college.ca',
+    })
+
+
+@pytest.mark.parametrize("descending, expected", [
+    (False, ['adam', 'Nora', 'Zed', None]),
+    (True, ['Zed', 'Nora', 'adam', None]),
+])
+def test_missing_names_sort_last(descending, expected):
+    dataset = Dataset(_frame(['Zed', np.nan, 'adam', 'Nora']), version='v1')
+    names = dataset.frame['student_name'].iloc[dataset.order('name', descending)]
+    assert [None if pd.isna(name) else name for name in names] == expected
+
+
+class SlowStore:
+    """A result store whose reads wait until released."""
+
+    def __init__(self):
+        self.current = 'v1'
+        self.released = threading.Event()
+
+    def version(self):
+        return self.current
+
+    def data_version(self):
+        return hash(self.current)
+
+    def read(self):
+        self.released.wait(timeout=10)
+        return StoredResults(self.current, time.time(), _frame(['A', 'B']))
+
+
+def test_get_serves_loaded_dataset_while_building():
+    store = SlowStore()
+    store.released.set()
+    cache = DatasetCache(store)
+    assert cache.reload().version == 'v1'
+
+    # Another worker stores new results; reading them is slow
+    store.released.clear()
+    store.current = 'v2'
+    start = time.perf_counter()
+    assert cache.get().version == 'v1'
+    assert time.perf_counter() - start < 1
+    assert cache.loading
+
+    store.released.set()
+    deadline = time.time() + 10
+    while cache.loading and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache.get().version == 'v2'
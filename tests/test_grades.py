@@ -0,0 +1,39 @@
+"""
+Bulk grade normalization against the per-value converter.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.data_preprocessing import convert_grade_to_numeric, normalize_grades
+
+MIXED_GRADES = [
+    # Numbers; values <= 1 are fractions
+    85, 72.5, 0.85, 1, 100,
+    # Numeric text
+    "85%", " 72.5 ", "0.5", "64.5%",
+    # Letters, in any case and padding
+    "A+", "b", " c- ", "F",
+    # Unknown codes and blanks
+    "INC", "W", "", None, np.nan,
+]
+
+
+def test_matches_convert_grade_to_numeric():
+    values = pd.Series(MIXED_GRADES, dtype=object)
+    expected = [convert_grade_to_numeric(value) for value in MIXED_GRADES]
+
+    np.testing.assert_allclose(normalize_grades(values).to_numpy(), expected, equal_nan=True)
+
+
+def test_known_values():
+    grades = normalize_grades(pd.Series([0.85, "85%", "B+", "XYZ"], dtype=object))
+    np.testing.assert_allclose(grades.to_numpy(), [85.0, 85.0, 87.0, np.nan], equal_nan=True)
+
+
+def test_keeps_index_and_name():
+    values = pd.Series(["A", 50], index=[10, 20], name="Current Overall Program Grade", dtype=object)
+    grades = normalize_grades(values)
+    assert list(grades.index) == [10, 20]
+    assert grades.name == "Current Overall Program Grade"
+    assert grades.dtype == float
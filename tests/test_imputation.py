@@ -0,0 +1,48 @@
+"""
+Group-wise grade imputation against the original per-program loop.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data_preprocessing import impute_missing_grades
+
+
+def loop_imputation(grades: pd.Series, programs: pd.Series) -> pd.Series:
+    """The per-program loop impute_missing_grades replaced."""
+    merged = pd.DataFrame({'grade': grades, 'Program': programs})
+    for program in merged['Program'].unique():
+        mask = merged['Program'] == program
+        avg = merged.loc[mask, 'grade'].mean()
+        if pd.notna(avg):
+            merged.loc[mask & merged['grade'].isna(), 'grade'] = avg
+    overall_avg = merged['grade'].mean()
+    if pd.notna(overall_avg):
+        merged['grade'] = merged['grade'].fillna(overall_avg)
+    return merged['grade']
+
+
+def test_matches_per_program_loop():
+    grades = pd.Series([80, np.nan, 60, np.nan, np.nan, 90, np.nan, np.nan], dtype=float)
+    # "Upgrading" has no grades at all, and one student has no program
+    programs = pd.Series([
+        "Nursing", "Nursing", "Nursing", "Upgrading", "Upgrading", "Paralegal", None, "Paralegal"
+    ])
+
+    filled, imputed = impute_missing_grades(grades, programs)
+
+    pd.testing.assert_series_equal(filled, loop_imputation(grades, programs), check_names=False)
+    assert filled[1] == 70
+    assert filled[7] == 90
+    # Program averages first, then the overall average of those filled grades
+    assert filled[3] == filled[4] == filled[6] == pytest.approx(78.0)
+    assert list(imputed) == [False, True, False, True, True, False, True, True]
+
+
+def test_all_grades_missing():
+    grades = pd.Series([np.nan, np.nan])
+    filled, imputed = impute_missing_grades(grades, pd.Series(["A", "B"]))
+    assert filled.isna().all()
+    assert not imputed.any()
+
@@ -0,0 +1,63 @@
+"""
+Background upload job status reporting.
+"""
+
+from datetime import datetime
+
+from app.jobs import JOB_COMPLETED, JOB_FAILED, JobRegistry, UploadJob
+from app.models import ExcelUploadResponse
+from utils.data_preprocessing import PIPELINE_STAGES, STAGE_MERGING, STAGE_READING
+
+
+def _response() -> ExcelUploadResponse:
+    return ExcelUploadResponse(
+        message="Processed 0 students successfully", students_processed=0, at_risk_count=0,
+        safe_count=0, avg_grade=0, avg_attendance=0, imputed_grades_by_program={},
+        timestamp=datetime.utcnow(),
+    )
+
+
+def _stage_statuses(job: UploadJob):
+    return {stage.name: stage.status for stage in job.to_status().stages}
+
+
+def test_stage_progress():
+    job = UploadJob("students.xlsx")
+    assert set(_stage_statuses(job).values()) == {"pending"}
+
+    job.start_stage(STAGE_READING, timestamp=100.0)
+    job.start_stage(STAGE_MERGING, timestamp=103.0)
+    status = job.to_status()
+    assert status.stage == STAGE_MERGING
+    assert [stage.status for stage in status.stages] == ["done", "running", "pending", "pending"]
+    assert status.stages[0].elapsed_seconds == 3.0
+
+
+def test_cache_hit_stages_are_skipped():
+    job = UploadJob("students.xlsx")
+    job.complete(_response())
+
+    status = job.to_status()
+    assert status.status == JOB_COMPLETED
+    assert _stage_statuses(job) == {stage: "skipped" for stage in PIPELINE_STAGES}
+
+
+def test_failed_job_leaves_unstarted_stages_pending():
+    job = UploadJob("students.xlsx")
+    job.start_stage(STAGE_READING)
+    job.fail("Grade column not found")
+
+    assert job.to_status().status == JOB_FAILED
+    assert _stage_statuses(job)[STAGE_READING] == "done"
+    assert _stage_statuses(job)[STAGE_MERGING] == "pending"
+
+
+def test_finished_jobs_expire():
+    registry = JobRegistry(ttl_seconds=0)
+    running = registry.create("a.xlsx")
+    finished = registry.create("b.xlsx")
+    finished.fail("error")
+    finished.finished_at -= 1
+
+    assert registry.get(finished.job_id) is None
+    assert registry.get(running.job_id) is running
@@ -0,0 +1,27 @@
+"""
+python -m app serve: sharing the upload pool between server workers.
+"""
+
+import os
+
+import pytest
+
+import app.__main__ as launcher
+
+
+@pytest.fixture
+def eight_cores(monkeypatch):
+    monkeypatch.setattr(launcher, "PROCESS_POOL_WORKERS", 8)
+    monkeypatch.delenv("PROCESS_POOL_WORKERS", raising=False)
+
+
+@pytest.mark.parametrize("workers, per_worker", [(2, "4"), (4, "2"), (16, "1")])
+def test_default_pool_is_divided(eight_cores, workers, per_worker):
+    launcher._share_upload_pool(workers)
+    assert os.environ["PROCESS_POOL_WORKERS"] == per_worker
+
+
+def test_explicit_pool_size_is_kept(eight_cores, monkeypatch):
+    monkeypatch.setenv("PROCESS_POOL_WORKERS", "3")
+    launcher._share_upload_pool(4)
+    assert os.environ["PROCESS_POOL_WORKERS"] == "3"
@@ -0,0 +1,84 @@
+"""
+Content-addressed result cache: hits, misses and LRU eviction.
+"""
+
+import os
+import time
+
+import pytest
+
+from app.result_cache import STATS_FILE, ResultCache, upload_hasher
+
+ENTRY_BYTES = 10_000
+
+
+@pytest.fixture
+def results_file(tmp_path):
+    path = tmp_path / "results.csv"
+    path.write_bytes(b"x" * ENTRY_BYTES)
+    return path
+
+
+def _key(content: bytes) -> str:
+    hasher = upload_hasher()
+    hasher.update(content)
+    return hasher.hexdigest()
+
+
+def _age(cache: ResultCache, key: str, seconds: float) -> None:
+    stamp = time.time() - seconds
+    os.utime(cache.cache_dir / key / STATS_FILE, (stamp, stamp))
+
+
+def test_miss_then_hit(tmp_path, results_file):
+    cache = ResultCache(tmp_path / "cache", 1024 * 1024, "results.csv")
+    key = _key(b"workbook")
+    assert cache.get(key) is None
+
+    cache.put(key, results_file, {'total_students': 3})
+    assert cache.get(key) == {'total_students': 3}
+    # Another upload misses, and nothing is left staged
+    assert cache.get(_key(b"other workbook")) is None
+    assert [path.name for path in cache.cache_dir.iterdir()] == [key]
+
+    output = tmp_path / "snapshot.csv"
+    cache.activate(key, output)
+    assert output.read_bytes() == results_file.read_bytes()
+
+
+def test_key_depends_on_content():
+    assert _key(b"a") == _key(b"a")
+    assert _key(b"a") != _key(b"b")
+
+
+def test_disabled(tmp_path, results_file):
+    cache = ResultCache(tmp_path / "cache", 0, "results.csv")
+    cache.put("key", results_file, {})
+    assert cache.get("key") is None
+    assert not cache.cache_dir.exists()
+
+
+def test_unreadable_entry_is_discarded(tmp_path, results_file):
+    cache = ResultCache(tmp_path / "cache", 1024 * 1024, "results.csv")
+    cache.put("key", results_file, {})
+    (cache.cache_dir / "key" / STATS_FILE).write_text("{not json")
+
+    assert cache.get("key") is None
+    assert not (cache.cache_dir / "key").exists()
+
+
+def test_least_recently_used_is_evicted(tmp_path, results_file):
+    # Room for two entries
+    cache = ResultCache(tmp_path / "cache", 2 * ENTRY_BYTES + 1000, "results.csv")
+    cache.put("a", results_file, {})
+    cache.put("b", results_file, {})
+    _age(cache, "a", 20)
+    _age(cache, "b", 10)
+
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a") is not None
+    cache.put("c", results_file, {})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
@@ -0,0 +1,60 @@
+"""
+Vectorized risk scoring against the original row-by-row rules.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data_preprocessing import (
+    compute_risk_codes,
+    determine_risk_label,
+    get_recommended_action,
+    score_risk,
+)
+
+TUTORING = "Schedule tutoring session and academic mentoring. Develop study plan."
+ATTENDANCE = "Attendance intervention meeting. Send attendance warning. Time management support."
+HIGH_RISK = "High Risk: Counseling + academic support + attendance intervention"
+NO_CONCERN = "Continue regular progress checks. No immediate concern."
+
+# (grade, attendance, label, action)
+CASES = [
+    (85.0, 90.0, "Safe", NO_CONCERN),
+    (65.0, 90.0, "At Risk", TUTORING),
+    (85.0, 60.0, "At Risk", ATTENDANCE),
+    (50.0, 40.0, "High Risk", HIGH_RISK),
+    # Thresholds are exclusive
+    (70.0, 70.0, "Safe", NO_CONCERN),
+    (69.9, 70.0, "At Risk", TUTORING),
+    # Missing values never count as low
+    (np.nan, 50.0, "At Risk", ATTENDANCE),
+    (50.0, np.nan, "At Risk", TUTORING),
+    (np.nan, 95.0, "Safe", NO_CONCERN),
+    (np.nan, np.nan, "Unknown", NO_CONCERN),
+    # Non-numeric input is treated as missing
+    ("n/a", 80.0, "Safe", NO_CONCERN),
+    (None, None, "Unknown", NO_CONCERN),
+]
+
+
+@pytest.mark.parametrize("grade, attendance, label, action", CASES)
+def test_single_student(grade, attendance, label, action):
+    assert determine_risk_label(grade, attendance) == label
+    assert get_recommended_action(grade, attendance) == action
+
+
+def test_whole_columns_match_single_students():
+    grades = pd.Series([case[0] for case in CASES], dtype=object)
+    attendance = pd.Series([case[1] for case in CASES], dtype=object)
+
+    labels, actions = score_risk(grades, attendance)
+
+    assert list(labels) == [case[2] for case in CASES]
+    assert list(actions) == [case[3] for case in CASES]
+
+
+def test_risk_codes_accept_plain_lists():
+    codes = compute_risk_codes([50, 85, None], [50, 85, None])
+    assert codes.dtype == np.int8
+    assert list(codes) == [3, 0, 4]
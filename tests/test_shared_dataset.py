@@ -0,0 +1,89 @@
+"""
+Shared, memory-mapped datasets: parity with Dataset and bundle collection.
+"""
+
+import os
+import time
+
+import pytest
+
+from app.dataset import Dataset
+from app.shared_dataset import (
+    BUNDLE_GRACE_SECONDS,
+    SharedDatasetCache,
+    SharedDatasetDirectory,
+    iter_payload,
+)
+from app.store import ResultStore
+from utils.data_preprocessing import process_excel_file
+
+
+@pytest.fixture(scope="module")
+def cohort_results(cohort_workbook):
+    results, _ = process_excel_file(cohort_workbook)
+    return results
+
+
+@pytest.fixture
+def store(tmp_path, cohort_results):
+    store = ResultStore(tmp_path / "db" / "results.db")
+    store.initialize()
+    store.replace(cohort_results, "v1")
+    return store
+
+
+def _payload_bytes(rendered):
+    return bytes(rendered.body), {encoding: bytes(body) for encoding, body in rendered.compressed.items()}
+
+
+def test_matches_in_memory_dataset(tmp_path, store):
+    stored = store.read()
+    expected = Dataset(stored.frame, version=stored.version, updated_at=stored.updated_at)
+    shared = SharedDatasetCache(store, SharedDatasetDirectory(tmp_path / "shared")).reload()
+
+    assert shared.etag == expected.etag
+    assert shared.last_modified == expected.last_modified
+    assert shared.summary_json == expected.summary_json
+    assert shared.programs_json == expected.programs_json
+    for at_risk_only in (False, True):
+        assert shared.count(at_risk_only) == expected.count(at_risk_only)
+        assert _payload_bytes(shared.rendered(at_risk_only)) == (
+            expected.rendered(at_risk_only).body, expected.rendered(at_risk_only).compressed
+        )
+        for key in ('risk', 'name', 'grade', 'attendance'):
+            order = shared.order(key, True, at_risk_only)
+            assert list(order) == list(expected.order(key, True, at_risk_only))
+
+    ids = [str(student_id) for student_id in stored.frame['student_id'][::29]] + ['unknown']
+    assert [shared.position(student_id) for student_id in ids] == [
+        expected.position(student_id) for student_id in ids
+    ]
+
+
+def test_stale_worker_survives_collection(tmp_path, store, cohort_results):
+    # Two workers share the database and the bundle directory
+    worker_a = SharedDatasetCache(store, SharedDatasetDirectory(tmp_path / "shared"))
+    other_store = ResultStore(store.db_path)
+    worker_b = SharedDatasetCache(other_store, SharedDatasetDirectory(tmp_path / "shared"))
+
+    old = worker_a.reload()
+    payload = _payload_bytes(old.rendered(False))
+
+    # Worker A sits idle past the grace period while worker B stores an upload
+    stamp = time.time() - BUNDLE_GRACE_SECONDS - 60
+    os.utime(tmp_path / "shared" / "v1", (stamp, stamp))
+    other_store.replace(cohort_results.iloc[:50], "v2")
+    assert worker_b.reload().version == "v2"
+    assert not (tmp_path / "shared" / "v1").exists()
+
+    # A's next request is served from the old version it still holds
+    dataset = worker_a.get()
+    assert dataset.version == "v1"
+    rendered = dataset.rendered(False)
+    assert _payload_bytes(rendered) == payload
+    assert b"".join(iter_payload(rendered.body, chunk_size=4096)) == payload[0]
+
+    deadline = time.time() + 10
+    while worker_a.get().version != "v2" and time.time() < deadline:
+        time.sleep(0.01)
+    assert worker_a.get().version == "v2"
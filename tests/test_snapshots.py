@@ -0,0 +1,85 @@
+"""
+Versioned results snapshots: publishing and garbage collection.
+"""
+
+import os
+import time
+
+import pytest
+
+from app.snapshots import SNAPSHOT_GRACE_SECONDS, SnapshotDirectory
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    directory = SnapshotDirectory(tmp_path / "results", ".csv")
+    directory.initialize()
+    return directory
+
+
+def _write(directory: SnapshotDirectory, version: str, age: float = 0):
+    path = directory.path_for(version)
+    path.write_text(version)
+    if age:
+        stamp = time.time() - age
+        os.utime(path, (stamp, stamp))
+    return path
+
+
+def _publish(directory: SnapshotDirectory, version: str) -> None:
+    with directory.publish_lock():
+        directory.publish(version)
+
+
+def test_publish_moves_current(snapshots):
+    assert snapshots.current_version() is None
+    assert snapshots.current_path() is None
+
+    _write(snapshots, "v1")
+    _publish(snapshots, "v1")
+    assert snapshots.current_version() == "v1"
+
+    _write(snapshots, "v2")
+    _publish(snapshots, "v2")
+    assert snapshots.current_path() == snapshots.path_for("v2")
+
+
+def test_old_snapshots_are_collected(snapshots):
+    old = _write(snapshots, "old", age=SNAPSHOT_GRACE_SECONDS + 60)
+    _write(snapshots, "new")
+    _publish(snapshots, "new")
+    assert not old.exists()
+
+
+def test_current_is_kept_however_old(snapshots):
+    current = _write(snapshots, "v1", age=SNAPSHOT_GRACE_SECONDS + 60)
+    _publish(snapshots, "v1")
+    assert current.exists()
+
+
+def test_recent_snapshot_of_another_process_is_kept(snapshots, tmp_path):
+    # Written by another worker, which has not imported it yet
+    other_worker = SnapshotDirectory(tmp_path / "results", ".csv")
+    pending = _write(other_worker, "pending")
+
+    _write(snapshots, "mine")
+    _publish(snapshots, "mine")
+    assert pending.exists()
+
+
+def test_pinned_snapshot_is_kept(snapshots):
+    with snapshots.pinned("in-use") as path:
+        path.write_text("in-use")
+        os.utime(path, (0, 0))
+        _write(snapshots, "v1")
+        _publish(snapshots, "v1")
+        assert path.exists()
+
+
+def test_pinning_restarts_grace_period(snapshots):
+    path = _write(snapshots, "reused", age=SNAPSHOT_GRACE_SECONDS + 60)
+    with snapshots.pinned("reused"):
+        pass
+    _write(snapshots, "v1")
+    _publish(snapshots, "v1")
+    assert path.exists()
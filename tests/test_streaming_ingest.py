@@ -0,0 +1,48 @@
+"""
+Streaming ingestion must produce what process_excel_file produces.
+"""
+
+import pandas as pd
+import pytest
+
+from utils.data_preprocessing import process_excel_file
+from utils.result_files import read_results, write_results
+from utils.streaming_ingest import process_excel_file_streaming
+
+# Small chunks, so duplicates and attendance lookups span chunk boundaries
+CHUNK_SIZE = 64
+
+
+def test_cohort_has_edge_cases(cohort_frames):
+    grades, attendance = cohort_frames
+    assert grades['Student#'].duplicated().any()
+    assert attendance['Student#'].duplicated().any()
+    assert (~attendance['Student#'].isin(grades['Student#'])).any()
+
+
+def test_streaming_matches_in_memory(tmp_path, cohort_workbook):
+    expected, expected_stats = process_excel_file(cohort_workbook)
+    # Both go through a results file, so values and dtypes compare like for like
+    write_results(expected, tmp_path / "memory.csv")
+    stats = process_excel_file_streaming(cohort_workbook, tmp_path / "streaming.csv", CHUNK_SIZE)
+
+    pd.testing.assert_frame_equal(
+        read_results(tmp_path / "streaming.csv"), read_results(tmp_path / "memory.csv")
+    )
+
+    for key in ('total_students', 'at_risk_count', 'safe_count', 'imputed_grades_by_program'):
+        assert stats[key] == expected_stats[key]
+    assert stats['avg_grade'] == pytest.approx(expected_stats['avg_grade'])
+    assert stats['avg_attendance'] == pytest.approx(expected_stats['avg_attendance'])
+
+
+def test_attendance_only_students_are_scored(tmp_path, cohort_frames, cohort_workbook):
+    grades, attendance = cohort_frames
+    attendance_only = set(attendance['Student#']) - set(grades['Student#'])
+
+    process_excel_file_streaming(cohort_workbook, tmp_path / "streaming.csv", CHUNK_SIZE)
+    results = read_results(tmp_path / "streaming.csv")
+
+    assert results['student_id'].is_unique
+    assert attendance_only <= set(results['student_id'])
+    assert len(results) == grades['Student#'].nunique() + len(attendance_only)
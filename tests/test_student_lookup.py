@@ -0,0 +1,30 @@
+"""
+Per-student lookups by ID.
+"""
+
+
+def test_get_student(client, results):
+    for student in results[::37]:
+        response = client.get(f"/students/{student['student_id']}")
+        assert response.status_code == 200
+        assert response.json() == student
+
+
+def test_unknown_student(client):
+    response = client.get("/students/no-such-student")
+    assert response.status_code == 404
+
+
+def test_lookup_keeps_request_order(client, results):
+    wanted = [results[5]['student_id'], results[1]['student_id'], results[5]['student_id']]
+    # IDs may be sent as numbers
+    response = client.post(
+        "/students/lookup", json={"student_ids": [int(wanted[0]), wanted[1], "unknown", wanted[2]]}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    # Duplicates are returned once
+    assert [student['student_id'] for student in body['students']] == wanted[:2]
+    assert body['students'] == [results[5], results[1]]
+    assert body['not_found'] == ["unknown"]
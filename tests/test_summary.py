@@ -0,0 +1,48 @@
+"""
+/summary and /summary/programs against aggregates of the /results listing.
+"""
+
+from collections import Counter, defaultdict
+
+import pytest
+
+
+def _mean(values):
+    values = [value for value in values if value is not None]
+    return round(sum(values) / len(values), 2) if values else None
+
+
+def test_summary(client, results):
+    counts = Counter(student['risk_label'] for student in results)
+
+    summary = client.get("/summary").json()
+
+    assert summary['total_students'] == len(results)
+    assert summary['high_risk_count'] == counts['High Risk']
+    assert summary['at_risk_count'] == counts['At Risk'] + counts['High Risk']
+    assert summary['safe_count'] == counts['Safe']
+    assert summary['avg_grade'] == pytest.approx(_mean(s['grade'] for s in results), abs=0.01)
+    assert summary['avg_attendance'] == pytest.approx(
+        _mean(s['attendance_rate'] for s in results), abs=0.01
+    )
+
+
+def test_program_summaries(client, results):
+    by_program = defaultdict(list)
+    for student in results:
+        by_program[student['program']].append(student)
+
+    summaries = client.get("/summary/programs").json()
+
+    assert sorted(summary['program'] for summary in summaries) == sorted(by_program)
+    for summary in summaries:
+        students = by_program[summary['program']]
+        counts = Counter(student['risk_label'] for student in students)
+        assert summary['total_students'] == len(students)
+        # Every label is listed, even at zero
+        assert {'High Risk', 'At Risk', 'Safe'} <= set(summary['risk_counts'])
+        assert {label: count for label, count in summary['risk_counts'].items() if count} == counts
+        assert summary['avg_grade'] == pytest.approx(_mean(s['grade'] for s in students), abs=0.01)
+        assert summary['avg_attendance'] == pytest.approx(
+            _mean(s['attendance_rate'] for s in students), abs=0.01
+        )
@@ -0,0 +1,45 @@
+"""
+Streaming uploads to disk.
+"""
+
+import asyncio
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.result_cache import upload_hasher
+from app.uploads import save_upload
+
+
+def _save(content: bytes, filename: str, target_dir, max_bytes: int = 1024 * 1024):
+    upload = UploadFile(io.BytesIO(content), filename=filename)
+    return asyncio.run(save_upload(upload, target_dir, max_bytes))
+
+
+def test_same_filename_gets_separate_files(tmp_path):
+    first = _save(b"first upload", "Students.XLSX", tmp_path)
+    second = _save(b"second upload", "Students.XLSX", tmp_path)
+
+    # Each upload is processed from its own file, keeping its suffix
+    assert first.path != second.path
+    assert first.path.suffix == second.path.suffix == ".xlsx"
+    assert first.path.read_bytes() == b"first upload"
+    assert second.path.read_bytes() == b"second upload"
+
+
+def test_size_and_cache_key(tmp_path):
+    content = b"x" * 3_000_000
+    saved = _save(content, "students.csv", tmp_path, max_bytes=len(content))
+
+    hasher = upload_hasher()
+    hasher.update(content)
+    assert saved.size == len(content)
+    assert saved.cache_key == hasher.hexdigest()
+
+
+def test_too_large_leaves_nothing_behind(tmp_path):
+    with pytest.raises(HTTPException) as error:
+        _save(b"x" * 2_000_000, "students.csv", tmp_path, max_bytes=1024 * 1024)
+    assert error.value.status_code == 413
+    assert list(tmp_path.iterdir()) == []
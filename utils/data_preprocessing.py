@@ -5,11 +5,36 @@ Process Excel file with Grades and Attendance worksheets.
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Tuple, Dict
+from typing import Callable, Tuple, Dict, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Pipeline stages reported to progress callbacks, in order
+STAGE_READING = 'reading'
+STAGE_MERGING = 'merging'
+STAGE_SCORING = 'scoring'
+STAGE_PERSISTING = 'persisting'
+PIPELINE_STAGES = (STAGE_READING, STAGE_MERGING, STAGE_SCORING, STAGE_PERSISTING)
+
+ProgressCallback = Optional[Callable[[str], None]]
+
+
+def report_progress(progress: ProgressCallback, stage: str) -> None:
+    """Notify a progress callback (if any) that a pipeline stage started."""
+    if progress is not None:
+        progress(stage)
+
+
+LETTER_GRADE_MAP = {'A+': 97, 'A': 93, 'A-': 90, 'B+': 87, 'B': 83, 'B-': 80,
+                    'C+': 77, 'C': 73, 'C-': 70, 'D+': 67, 'D': 63, 'D-': 60, 'F': 50}
+
+# Categorical lookup for bulk conversion; code -1 (unknown letter) maps to NaN
+_LETTER_GRADE_DTYPE = pd.CategoricalDtype(list(LETTER_GRADE_MAP))
+_LETTER_GRADE_VALUES = np.append(
+    np.array(list(LETTER_GRADE_MAP.values()), dtype=float), np.nan
+)
+
 
 def convert_grade_to_numeric(grade_value) -> float:
     """Convert grade to numeric (0-100)."""
@@ -25,72 +50,221 @@ def convert_grade_to_numeric(grade_value) -> float:
         grade_num = float(grade_str)
         return grade_num if grade_num > 1 else grade_num * 100
     except ValueError:
-        letter_map = {'A+': 97, 'A': 93, 'A-': 90, 'B+': 87, 'B': 83, 'B-': 80,
-                     'C+': 77, 'C': 73, 'C-': 70, 'D+': 67, 'D': 63, 'D-': 60, 'F': 50}
-        return letter_map.get(grade_str, np.nan)
+        return LETTER_GRADE_MAP.get(grade_str, np.nan)
 
 
-def determine_risk_label(grade: float, attendance: float) -> str:
-    """Determine risk label."""
-    # Ensure numeric types
-    try:
-        grade = float(grade) if not pd.isna(grade) else np.nan
-    except (ValueError, TypeError):
-        grade = np.nan
+def normalize_grades(values: pd.Series) -> pd.Series:
+    """
+    Convert a column of mixed grades to numeric (0-100) in bulk.
+    
+    Numbers, percent strings and letter grades are each converted as a
+    group; values <= 1 are treated as fractions, as in
+    convert_grade_to_numeric.
+    
+    Args:
+        values: Series of raw grade values
+    
+    Returns:
+        float Series aligned with the input index
+    """
+    values = pd.Series(values)
+    grades = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+    
+    # Strings that did not parse as-is: percents, padded numbers, letters
+    pending = np.isnan(grades) & values.notna().to_numpy()
+    if pending.any():
+        text = (values[pending].astype(str).str.strip().str.upper()
+                .str.replace('%', '', regex=False))
+        parsed = pd.to_numeric(text, errors='coerce').to_numpy(dtype=float)
+        
+        letters = np.isnan(parsed)
+        if letters.any():
+            codes = text[letters].astype(_LETTER_GRADE_DTYPE).cat.codes.to_numpy()
+            parsed[letters] = _LETTER_GRADE_VALUES[codes]
+        grades[pending] = parsed
+    
+    # Letter grades are all > 1, so the fraction rule leaves them untouched
+    grades = np.where(grades > 1, grades, grades * 100)
+    return pd.Series(grades, index=values.index, name=values.name)
+
+
+def _hours_column(df: pd.DataFrame, column: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (hours with missing as 0, mask of non-numeric entries)."""
+    if column not in df.columns:
+        return np.zeros(len(df)), np.zeros(len(df), dtype=bool)
+    raw = df[column]
+    hours = pd.to_numeric(raw, errors='coerce').to_numpy(dtype=float)
+    invalid = np.isnan(hours) & raw.notna().to_numpy()
+    return np.where(np.isnan(hours), 0.0, hours), invalid
+
+
+def calculate_attendance_rate(df: pd.DataFrame) -> pd.Series:
+    """
+    Calculate attendance rate (0-100) for every row at once.
     
-    try:
-        attendance = float(attendance) if not pd.isna(attendance) else np.nan
-    except (ValueError, TypeError):
-        attendance = np.nan
+    Uses 'Attended % to Date' where it is numeric, otherwise
+    attended / scheduled hours. Rows with no scheduled hours or
+    non-numeric hours get NaN.
+    
+    Args:
+        df: Merged grades/attendance DataFrame
     
-    if pd.isna(grade) and pd.isna(attendance):
-        return "Unknown"
+    Returns:
+        float Series aligned with df.index
+    """
+    attended, attended_invalid = _hours_column(df, 'Attended Hours to Date')
+    scheduled, scheduled_invalid = _hours_column(df, 'Scheduled Hours to Date')
     
-    grade_low = not pd.isna(grade) and grade < 70
-    attendance_low = not pd.isna(attendance) and attendance < 70
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = np.where(scheduled > 0, (attended / scheduled) * 100, np.nan)
+    rate[attended_invalid | scheduled_invalid] = np.nan
     
-    if grade_low and attendance_low:
-        return "High Risk"
-    elif grade_low or attendance_low:
-        return "At Risk"
-    return "Safe"
+    if 'Attended % to Date' in df.columns:
+        percent = pd.to_numeric(df['Attended % to Date'], errors='coerce').to_numpy(dtype=float)
+        rate = np.where(np.isnan(percent), rate, percent)
+    
+    return pd.Series(rate, index=df.index)
 
 
-def get_recommended_action(grade: float, attendance: float) -> str:
-    """Get recommended action."""
-    # Ensure numeric types
-    try:
-        grade = float(grade) if not pd.isna(grade) else np.nan
-    except (ValueError, TypeError):
-        grade = np.nan
+def impute_missing_grades(grades: pd.Series, programs: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Fill missing grades with the program average, then the overall average.
     
-    try:
-        attendance = float(attendance) if not pd.isna(attendance) else np.nan
-    except (ValueError, TypeError):
-        attendance = np.nan
+    Program averages come from a single groupby pass. Programs whose grades
+    are all missing (and rows without a program) fall through to the
+    overall average of the program-filled grades.
     
-    grade_low = not pd.isna(grade) and grade < 70
-    attendance_low = not pd.isna(attendance) and attendance < 70
+    Args:
+        grades: Numeric grades, NaN where missing
+        programs: Program of each student, aligned with grades
     
-    if grade_low and attendance_low:
-        return "High Risk: Counseling + academic support + attendance intervention"
-    elif grade_low:
-        return "Schedule tutoring session and academic mentoring. Develop study plan."
-    elif attendance_low:
-        return "Attendance intervention meeting. Send attendance warning. Time management support."
-    return "Continue regular progress checks. No immediate concern."
-
-
-def process_excel_file(file_path: Path) -> Tuple[pd.DataFrame, Dict]:
-    """Process Excel file with Grades and Attendance worksheets."""
-    logger.info(f"Processing: {file_path}")
+    Returns:
+        Tuple of (filled grades, boolean mask of imputed rows)
+    """
+    missing = grades.isna()
+    filled = grades.fillna(grades.groupby(programs).transform('mean'))
     
-    # Read Excel file
-    excel_file = pd.ExcelFile(file_path)
-    sheet_names = excel_file.sheet_names
-    logger.info(f"Available sheets: {sheet_names}")
+    overall_avg = filled.mean()
+    if pd.notna(overall_avg):
+        filled = filled.fillna(overall_avg)
     
-    # Find sheets (case-insensitive)
+    return filled, missing & filled.notna()
+
+
+# Bump when grading/attendance/risk rules change (invalidates cached results)
+SCORING_VERSION = 1
+
+# Risk thresholds (percent)
+GRADE_RISK_THRESHOLD = 70
+ATTENDANCE_RISK_THRESHOLD = 70
+
+# Risk codes: bit 0 = grade low, bit 1 = attendance low, 4 = no data
+RISK_UNKNOWN = 4
+
+RISK_LABELS = np.array(
+    ["Safe", "At Risk", "At Risk", "High Risk", "Unknown"], dtype=object
+)
+
+RECOMMENDED_ACTIONS = np.array([
+    "Continue regular progress checks. No immediate concern.",
+    "Schedule tutoring session and academic mentoring. Develop study plan.",
+    "Attendance intervention meeting. Send attendance warning. Time management support.",
+    "High Risk: Counseling + academic support + attendance intervention",
+    "Continue regular progress checks. No immediate concern.",
+], dtype=object)
+
+
+def _to_float_array(values) -> np.ndarray:
+    """Coerce values to a float array (invalid entries become NaN)."""
+    if not isinstance(values, pd.Series):
+        values = pd.Series(values)
+    return pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+
+
+def compute_risk_codes(grades, attendance) -> np.ndarray:
+    """
+    Compute risk codes for whole columns at once.
+    
+    Args:
+        grades: Array-like of grades (0-100)
+        attendance: Array-like of attendance rates (0-100)
+    
+    Returns:
+        int8 array of risk codes indexing RISK_LABELS / RECOMMENDED_ACTIONS
+    """
+    grades = _to_float_array(grades)
+    attendance = _to_float_array(attendance)
+    
+    # NaN compares False, so missing values never count as low
+    grade_low = grades < GRADE_RISK_THRESHOLD
+    attendance_low = attendance < ATTENDANCE_RISK_THRESHOLD
+    
+    codes = grade_low.astype(np.int8) | (attendance_low.astype(np.int8) << 1)
+    codes[np.isnan(grades) & np.isnan(attendance)] = RISK_UNKNOWN
+    return codes
+
+
+def score_risk(grades, attendance) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized risk scoring.
+    
+    Args:
+        grades: Array-like of grades (0-100)
+        attendance: Array-like of attendance rates (0-100)
+    
+    Returns:
+        Tuple of (risk_labels, recommended_actions) object arrays
+    """
+    codes = compute_risk_codes(grades, attendance)
+    return RISK_LABELS[codes], RECOMMENDED_ACTIONS[codes]
+
+
+def determine_risk_label(grade: float, attendance: float) -> str:
+    """Determine risk label."""
+    return RISK_LABELS[compute_risk_codes([grade], [attendance])[0]]
+
+
+def get_recommended_action(grade: float, attendance: float) -> str:
+    """Get recommended action."""
+    return RECOMMENDED_ACTIONS[compute_risk_codes([grade], [attendance])[0]]
+
+
+# Merged column -> output column
+RESULT_COLUMNS = {
+    'Student#': 'student_id',
+    'Student Name': 'student_name',
+    'Program': 'program',
+    'grade': 'grade',
+    'attendance_rate': 'attendance_rate',
+    'risk_label': 'risk_label',
+    'recommended_action': 'recommended_action',
+    'email': 'email',
+}
+
+
+def find_student_column(columns) -> Optional[str]:
+    """Find the Student# column (case-insensitive)."""
+    for col in columns:
+        if 'student' in col.lower() and '#' in col.lower():
+            return col
+    return None
+
+
+def find_grade_column(columns) -> Optional[str]:
+    """Find the current/overall grade column (case-insensitive)."""
+    for col in columns:
+        if 'grade' in col.lower() and ('current' in col.lower() or 'overall' in col.lower()):
+            return col
+    return None
+
+
+def generate_emails(names: pd.Series) -> pd.Series:
+    """Generate college email addresses from student names."""
+    return names.astype(str).str.lower().str.replace(' ', '.', regex=False) + '@college.ca'
+
+
+def resolve_sheet_names(sheet_names: List[str]) -> Tuple[str, str]:
+    """Pick grades and attendance sheets (case-insensitive, positional fallback)."""
     grades_sheet = None
     attendance_sheet = None
     
@@ -105,47 +279,96 @@ def process_excel_file(file_path: Path) -> Tuple[pd.DataFrame, Dict]:
     if not attendance_sheet:
         attendance_sheet = sheet_names[1] if len(sheet_names) > 1 else sheet_names[0]
     
-    # Read worksheets
-    grades_df = pd.read_excel(file_path, sheet_name=grades_sheet)
-    attendance_df = pd.read_excel(file_path, sheet_name=attendance_sheet)
+    return grades_sheet, attendance_sheet
+
+
+def read_workbook(file_path: Path) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Read the grades and attendance worksheets from one open workbook.
+    
+    The file is opened once and the handle reused for every sheet; a sheet
+    that serves as both grades and attendance is parsed only once.
+    
+    Args:
+        file_path: Path to the Excel workbook
+    
+    Returns:
+        Tuple of (grades_df, attendance_df)
+    """
+    with pd.ExcelFile(file_path) as excel_file:
+        sheet_names = excel_file.sheet_names
+        logger.info(f"Available sheets: {sheet_names}")
+        
+        grades_sheet, attendance_sheet = resolve_sheet_names(sheet_names)
+        
+        parsed: Dict[str, pd.DataFrame] = {}
+        for sheet in (grades_sheet, attendance_sheet):
+            if sheet not in parsed:
+                parsed[sheet] = excel_file.parse(sheet_name=sheet)
+    
+    # Shallow copy so callers can relabel columns independently
+    return parsed[grades_sheet], parsed[attendance_sheet].copy(deep=False)
+
+
+def process_excel_file(file_path: Path, progress: ProgressCallback = None) -> Tuple[pd.DataFrame, Dict]:
+    """Process Excel file with Grades and Attendance worksheets."""
+    logger.info(f"Processing: {file_path}")
+    
+    # Read both worksheets from a single open workbook
+    report_progress(progress, STAGE_READING)
+    grades_df, attendance_df = read_workbook(file_path)
     
+    return process_student_frames(grades_df, attendance_df, progress)
+
+
+def process_student_frames(
+    grades_df: pd.DataFrame,
+    attendance_df: Optional[pd.DataFrame] = None,
+    progress: ProgressCallback = None
+) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Merge, score and summarize grades and attendance data.
+    
+    Args:
+        grades_df: Grades table (Student#, grade column, ...)
+        attendance_df: Attendance table; None when grades_df is a single
+            flat table that already holds the attendance columns
+        progress: Optional callback told when each pipeline stage starts
+    
+    Returns:
+        Tuple of (result DataFrame, statistics dictionary)
+    """
     # Standardize column names
     grades_df.columns = grades_df.columns.str.strip()
-    attendance_df.columns = attendance_df.columns.str.strip()
+    if attendance_df is not None:
+        attendance_df.columns = attendance_df.columns.str.strip()
     
     # Find Student# column
-    student_col_g = None
-    student_col_a = None
-    
-    for col in grades_df.columns:
-        if 'student' in col.lower() and '#' in col.lower():
-            student_col_g = col
-            break
-    
-    for col in attendance_df.columns:
-        if 'student' in col.lower() and '#' in col.lower():
-            student_col_a = col
-            break
+    student_col_g = find_student_column(grades_df.columns)
+    student_col_a = (
+        find_student_column(attendance_df.columns) if attendance_df is not None else student_col_g
+    )
     
     if not student_col_g or not student_col_a:
         raise ValueError("Student# column not found")
     
     # Rename to standard
     grades_df = grades_df.rename(columns={student_col_g: 'Student#'})
-    attendance_df = attendance_df.rename(columns={student_col_a: 'Student#'})
+    if attendance_df is not None:
+        attendance_df = attendance_df.rename(columns={student_col_a: 'Student#'})
     
     # Find grade column
-    grade_col = None
-    for col in grades_df.columns:
-        if 'grade' in col.lower() and ('current' in col.lower() or 'overall' in col.lower()):
-            grade_col = col
-            break
+    grade_col = find_grade_column(grades_df.columns)
     
     if not grade_col:
         raise ValueError("Grade column not found")
     
     # Merge
-    merged = pd.merge(grades_df, attendance_df, on='Student#', how='outer', suffixes=('_g', '_a'))
+    report_progress(progress, STAGE_MERGING)
+    if attendance_df is not None:
+        merged = pd.merge(grades_df, attendance_df, on='Student#', how='outer', suffixes=('_g', '_a'))
+    else:
+        merged = grades_df.copy()
     
     # Get student name
     if 'Student Name_g' in merged.columns:
@@ -164,68 +387,36 @@ def process_excel_file(file_path: Path) -> Tuple[pd.DataFrame, Dict]:
         merged['Program'] = 'Unknown'
     
     # Convert grade - ensure numeric
-    merged['grade'] = merged[grade_col].apply(convert_grade_to_numeric)
-    merged['grade'] = pd.to_numeric(merged['grade'], errors='coerce')
+    report_progress(progress, STAGE_SCORING)
+    merged['grade'] = normalize_grades(merged[grade_col])
     
     # Calculate attendance rate
-    def calc_attendance(row):
-        if 'Attended % to Date' in merged.columns and pd.notna(row.get('Attended % to Date')):
-            try:
-                return float(row['Attended % to Date'])
-            except (ValueError, TypeError):
-                pass
-        attended = row.get('Attended Hours to Date', 0)
-        scheduled = row.get('Scheduled Hours to Date', 0)
-        try:
-            attended = float(attended) if pd.notna(attended) else 0
-            scheduled = float(scheduled) if pd.notna(scheduled) else 0
-            if scheduled > 0:
-                return (attended / scheduled) * 100
-        except (ValueError, TypeError):
-            pass
-        return np.nan
-    
-    merged['attendance_rate'] = merged.apply(calc_attendance, axis=1)
-    merged['attendance_rate'] = pd.to_numeric(merged['attendance_rate'], errors='coerce')
-    
-    # Fill missing grades with program average
-    for program in merged['Program'].unique():
-        mask = merged['Program'] == program
-        avg = merged.loc[mask, 'grade'].mean()
-        if pd.notna(avg):
-            merged.loc[mask & merged['grade'].isna(), 'grade'] = avg
-    
-    # Fill remaining with overall average
-    overall_avg = merged['grade'].mean()
-    if pd.notna(overall_avg):
-        merged['grade'] = merged['grade'].fillna(overall_avg)
+    merged['attendance_rate'] = calculate_attendance_rate(merged)
     
-    # Determine risk
-    merged['risk_label'] = merged.apply(
-        lambda row: determine_risk_label(row['grade'], row['attendance_rate']), axis=1
+    # Fill missing grades with program average, then overall average
+    merged['grade'], merged['grade_imputed'] = impute_missing_grades(
+        merged['grade'], merged['Program']
     )
     
-    # Get recommendations
-    merged['recommended_action'] = merged.apply(
-        lambda row: get_recommended_action(row['grade'], row['attendance_rate']), axis=1
+    # Determine risk and recommendations in one vectorized pass
+    merged['risk_label'], merged['recommended_action'] = score_risk(
+        merged['grade'], merged['attendance_rate']
     )
     
     # Generate emails
-    merged['email'] = merged['Student Name'].apply(
-        lambda x: f"{str(x).lower().replace(' ', '.')}@college.ca"
-    )
+    merged['email'] = generate_emails(merged['Student Name'])
     
     # Drop duplicates
     merged = merged.drop_duplicates(subset=['Student#'], keep='first')
     
-    # Select final columns
-    result = merged[[
-        'Student#', 'Student Name', 'Program', 'grade', 
-        'attendance_rate', 'risk_label', 'recommended_action', 'email'
-    ]].copy()
+    # Imputed grades per program (after de-duplication, so counts match result)
+    imputed_by_program = (
+        merged.loc[merged['grade_imputed'], 'Program'].fillna('Unknown').astype(str).value_counts()
+    )
     
-    result.columns = ['student_id', 'student_name', 'program', 'grade', 
-                     'attendance_rate', 'risk_label', 'recommended_action', 'email']
+    # Select final columns
+    result = merged[list(RESULT_COLUMNS)].copy()
+    result.columns = list(RESULT_COLUMNS.values())
     
     # Ensure final columns are numeric
     result['grade'] = pd.to_numeric(result['grade'], errors='coerce')
@@ -237,7 +428,8 @@ def process_excel_file(file_path: Path) -> Tuple[pd.DataFrame, Dict]:
         'at_risk_count': len(result[result['risk_label'].isin(['At Risk', 'High Risk'])]),
         'safe_count': len(result[result['risk_label'] == 'Safe']),
         'avg_grade': float(result['grade'].mean()) if not result['grade'].isna().all() else 0.0,
-        'avg_attendance': float(result['attendance_rate'].mean()) if not result['attendance_rate'].isna().all() else 0.0
+        'avg_attendance': float(result['attendance_rate'].mean()) if not result['attendance_rate'].isna().all() else 0.0,
+        'imputed_grades_by_program': {str(k): int(v) for k, v in imputed_by_program.items()}
     }
     
     return result, stats
@@ -0,0 +1,123 @@
+"""
+Upload format detection and loaders for Excel, CSV, Parquet and Arrow files.
+Non-Excel uploads hold a single flat table with both grade and attendance
+columns and go through the same scoring as Excel workbooks.
+"""
+
+from pathlib import Path
+from typing import Dict, Tuple
+import logging
+
+import pandas as pd
+
+from utils.data_preprocessing import (
+    STAGE_READING,
+    ProgressCallback,
+    process_excel_file,
+    process_student_frames,
+    report_progress,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+EXCEL = 'excel'
+CSV = 'csv'
+PARQUET = 'parquet'
+ARROW = 'arrow'
+
+# Extension -> format
+SUPPORTED_EXTENSIONS = {
+    '.xlsx': EXCEL,
+    '.xls': EXCEL,
+    '.csv': CSV,
+    '.parquet': PARQUET,
+    '.pq': PARQUET,
+    '.arrow': ARROW,
+    '.feather': ARROW,
+    '.ipc': ARROW,
+}
+
+# Leading bytes -> format (checked before the extension)
+_MAGIC_BYTES = [
+    (b'PAR1', PARQUET),
+    (b'ARROW1', ARROW),
+    (b'\xff\xff\xff\xff', ARROW),  # Arrow IPC stream (continuation marker)
+    (b'PK\x03\x04', EXCEL),  # .xlsx (zip)
+    (b'\xd0\xcf\x11\xe0', EXCEL),  # .xls (OLE2)
+]
+
+
+def detect_file_format(file_path: Path) -> str:
+    """
+    Detect the format of an uploaded file from its leading bytes or extension.
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(8)
+
+    for magic, file_format in _MAGIC_BYTES:
+        if head.startswith(magic):
+            return file_format
+
+    file_format = SUPPORTED_EXTENSIONS.get(Path(file_path).suffix.lower())
+    if file_format is None:
+        raise ValueError(f"Unsupported file type: {Path(file_path).name}")
+    return file_format
+
+
+def load_csv(file_path: Path) -> pd.DataFrame:
+    """Load a CSV export (pyarrow engine when available)."""
+    return pd.read_csv(file_path, engine=CSV_ENGINE)
+
+
+def load_parquet(file_path: Path) -> pd.DataFrame:
+    """Load a Parquet export."""
+    return pd.read_parquet(file_path)
+
+
+def load_arrow(file_path: Path) -> pd.DataFrame:
+    """Load an Arrow IPC file (Feather v2) or stream."""
+    import pyarrow as pa
+
+    with pa.memory_map(str(file_path)) as source:
+        try:
+            table = pa.ipc.open_file(source).read_all()
+        except pa.ArrowInvalid:
+            source.seek(0)
+            table = pa.ipc.open_stream(source).read_all()
+    return table.to_pandas()
+
+
+LOADERS = {
+    CSV: load_csv,
+    PARQUET: load_parquet,
+    ARROW: load_arrow,
+}
+
+
+def process_data_file(file_path: Path, progress: ProgressCallback = None) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Process an uploaded Excel, CSV, Parquet or Arrow file.
+
+    Args:
+        file_path: Path to the uploaded file
+        progress: Optional callback told when each pipeline stage starts
+
+    Returns:
+        Tuple of (result DataFrame, statistics dictionary)
+    """
+    file_format = detect_file_format(file_path)
+    if file_format == EXCEL:
+        return process_excel_file(file_path, progress)
+
+    logger.info(f"Processing {file_format}: {file_path}")
+    report_progress(progress, STAGE_READING)
+    return process_student_frames(LOADERS[file_format](file_path), progress=progress)
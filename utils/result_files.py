@@ -0,0 +1,133 @@
+"""
+Read and write processed results files as CSV or Parquet.
+
+Parquet results use a fixed schema with dictionary-encoded string
+columns.
+"""
+
+from pathlib import Path
+import logging
+
+import numpy as np
+import pandas as pd
+
+from utils.data_preprocessing import RESULT_COLUMNS
+from utils.file_formats import CSV, PARQUET
+
+logger = logging.getLogger(__name__)
+
+# Results format -> file suffix
+RESULT_SUFFIXES = {
+    CSV: '.csv',
+    PARQUET: '.parquet',
+}
+
+TEXT_COLUMNS = ['student_id', 'student_name', 'program', 'risk_label', 'recommended_action', 'email']
+FLOAT_COLUMNS = ['grade', 'attendance_rate']
+
+# Few distinct values per column: stored once per row group with integer codes
+DICTIONARY_COLUMNS = ['program', 'risk_label', 'recommended_action']
+
+PARQUET_ROW_GROUP_SIZE = 50_000
+
+
+def results_format(path: Path) -> str:
+    """
+    The format of a results file, from its suffix.
+
+    Raises:
+        ValueError: If the suffix is not a results format
+    """
+    suffix = Path(path).suffix.lower()
+    for file_format, format_suffix in RESULT_SUFFIXES.items():
+        if suffix == format_suffix:
+            return file_format
+    raise ValueError(f"Unsupported results file: {Path(path).name}")
+
+
+def _result_schema():
+    import pyarrow as pa
+
+    return pa.schema(
+        [(name, pa.string()) if name in TEXT_COLUMNS else (name, pa.float64())
+         for name in RESULT_COLUMNS.values()]
+    )
+
+
+def results_table(frame: pd.DataFrame):
+    """A results frame as an Arrow table with the fixed results schema."""
+    import pyarrow as pa
+
+    columns = {}
+    for name in RESULT_COLUMNS.values():
+        values = frame[name]
+        if name in TEXT_COLUMNS:
+            values = values.astype(str).where(values.notna(), None)
+        columns[name] = values
+    return pa.Table.from_pandas(pd.DataFrame(columns), schema=_result_schema(), preserve_index=False)
+
+
+class ResultWriter:
+    """Writes a results file chunk by chunk, in the format of its suffix."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.format = results_format(self.path)
+        self._parquet_writer = None
+        self._rows = 0
+
+    def write(self, frame: pd.DataFrame) -> None:
+        if self.format == PARQUET:
+            if self._parquet_writer is None:
+                import pyarrow.parquet as pq
+
+                self._parquet_writer = pq.ParquetWriter(
+                    self.path, _result_schema(), use_dictionary=DICTIONARY_COLUMNS
+                )
+            self._parquet_writer.write_table(results_table(frame), row_group_size=PARQUET_ROW_GROUP_SIZE)
+        else:
+            first = self._rows == 0
+            frame.to_csv(self.path, mode='w' if first else 'a', header=first, index=False)
+        self._rows += len(frame)
+
+    def close(self) -> None:
+        """Finish the file (an empty results file still gets its header)."""
+        if self._rows == 0 and self._parquet_writer is None:
+            self.write(pd.DataFrame(columns=list(RESULT_COLUMNS.values())))
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def __enter__(self) -> 'ResultWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def write_results(frame: pd.DataFrame, path: Path) -> None:
+    """Write a results frame as CSV or Parquet, by the path's suffix."""
+    with ResultWriter(path) as writer:
+        writer.write(frame)
+
+
+def read_results(path: Path) -> pd.DataFrame:
+    """
+    Read a results file written by write_results or ResultWriter.
+
+    Args:
+        path: Results file (.csv or .parquet)
+
+    Returns:
+        Results DataFrame (missing text values are NaN, as from read_csv)
+    """
+    columns = list(RESULT_COLUMNS.values())
+
+    if results_format(path) == PARQUET:
+        import pyarrow.parquet as pq
+
+        frame = pq.read_table(path, columns=columns).to_pandas()
+        frame[TEXT_COLUMNS] = frame[TEXT_COLUMNS].fillna(np.nan)
+        return frame
+
+    return pd.read_csv(path, usecols=columns)[columns]
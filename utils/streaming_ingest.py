@@ -0,0 +1,438 @@
+"""
+Streaming ingestion for very large Excel workbooks.
+Reads worksheets row by row with openpyxl's read-only mode so peak memory
+is bounded by the chunk size instead of the workbook size.
+"""
+
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from utils.data_preprocessing import (
+    RESULT_COLUMNS,
+    STAGE_MERGING,
+    STAGE_PERSISTING,
+    STAGE_READING,
+    STAGE_SCORING,
+    ProgressCallback,
+    calculate_attendance_rate,
+    find_grade_column,
+    find_student_column,
+    generate_emails,
+    normalize_grades,
+    report_progress,
+    resolve_sheet_names,
+    score_risk,
+)
+from utils.result_files import ResultWriter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def iter_sheet_chunks(worksheet, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Yield a read-only worksheet as DataFrames of at most chunk_size rows.
+
+    The first row is used as the header (stripped, as in process_excel_file).
+    Completely empty rows are skipped.
+    """
+    rows = worksheet.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return
+    columns = _header_columns(header)
+
+    buffer = []
+    for row in rows:
+        if all(value is None for value in row):
+            continue
+        buffer.append(row[:len(columns)])
+        if len(buffer) >= chunk_size:
+            yield pd.DataFrame(buffer, columns=columns)
+            buffer = []
+    if buffer:
+        yield pd.DataFrame(buffer, columns=columns)
+
+
+def _header_columns(header: tuple) -> List[str]:
+    """Column names for a header row (stripped, pandas-style placeholders)."""
+    return [
+        str(name).strip() if name is not None else f"Unnamed: {i}"
+        for i, name in enumerate(header)
+    ]
+
+
+def _sheet_header(worksheet) -> List[str]:
+    """Return the column names of a worksheet's first row."""
+    for row in worksheet.iter_rows(max_row=1, values_only=True):
+        return _header_columns(row)
+    return []
+
+
+def _student_ids(ids: pd.Series) -> pd.Series:
+    """Use None for missing Student# so all missing IDs share one key."""
+    return ids.astype(object).where(ids.notna(), None)
+
+
+def _first_per_key(table: pd.DataFrame) -> pd.DataFrame:
+    """Keep the first row per Student#, summing the 'rows' counts."""
+    codes, _ = pd.factorize(table.index, use_na_sentinel=False)
+    _, first = np.unique(codes, return_index=True)
+    first.sort()
+    rows = np.bincount(codes, weights=table['rows'].to_numpy()).astype(np.int64)
+    table = table.iloc[first].copy()
+    table['rows'] = rows[codes[first]]
+    return table
+
+
+def build_attendance_table(
+    worksheet,
+    student_col: str,
+    keep_columns: Dict[str, str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> pd.DataFrame:
+    """
+    Stream the attendance sheet into a compact table keyed by Student#.
+
+    Only the attendance rate plus the sheet columns named in keep_columns
+    (sheet column -> table column) are kept; the first row per Student# wins
+    and 'rows' records how many rows the sheet had for that student.
+    """
+    parts = []
+    for chunk in iter_sheet_chunks(worksheet, chunk_size):
+        part = pd.DataFrame(
+            {'attendance_rate': calculate_attendance_rate(chunk).to_numpy(), 'rows': 1},
+            index=pd.Index(_student_ids(chunk[student_col]), name='Student#')
+        )
+        for source, target in keep_columns.items():
+            part[target] = chunk[source].to_numpy()
+        parts.append(_first_per_key(part))
+
+    if not parts:
+        return pd.DataFrame(
+            columns=['attendance_rate', 'rows', *keep_columns.values()],
+            index=pd.Index([], name='Student#', dtype=object)
+        )
+
+    return _first_per_key(pd.concat(parts))
+
+
+class _WorkbookLayout:
+    """Column discovery for a streamed workbook, mirroring the merge rules."""
+
+    def __init__(self, grades_header: List[str], attendance_header: List[str]):
+        self.student_col_g = find_student_column(grades_header)
+        self.student_col_a = find_student_column(attendance_header)
+        if not self.student_col_g or not self.student_col_a:
+            raise ValueError("Student# column not found")
+
+        self.grade_col = find_grade_column(grades_header)
+        if not self.grade_col:
+            raise ValueError("Grade column not found")
+
+        # Same precedence as the merged-frame lookups in process_excel_file
+        self.grades_has_name = 'Student Name' in grades_header
+        self.attendance_has_name = 'Student Name' in attendance_header
+        self.grades_has_program = 'Program Name' in grades_header
+        self.attendance_has_program = (
+            not self.grades_has_program and 'Program Name' in attendance_header
+        )
+
+    @property
+    def attendance_columns(self) -> Dict[str, str]:
+        """Attendance sheet columns to keep in the keyed table."""
+        columns = {}
+        if self.attendance_has_name:
+            columns['Student Name'] = 'Student Name'
+        if self.attendance_has_program:
+            columns['Program Name'] = 'Program'
+        return columns
+
+
+class _AttendanceLookup:
+    """Rows of the attendance table matched to a batch of Student# values."""
+
+    def __init__(self, table: pd.DataFrame, student_ids: pd.Series):
+        self.index = student_ids.index
+        self.positions = table.index.get_indexer(student_ids)
+        self.found = self.positions >= 0
+        self.table = table
+
+    def column(self, name: str) -> pd.Series:
+        """Values of a table column for the batch (NaN where unmatched)."""
+        if not len(self.table):
+            return pd.Series(np.nan, index=self.index, dtype=object)
+        values = self.table[name].to_numpy()[np.where(self.found, self.positions, 0)]
+        return pd.Series(values, index=self.index).where(self.found)
+
+
+def _programs(
+    layout: _WorkbookLayout,
+    chunk: pd.DataFrame,
+    lookup: _AttendanceLookup
+) -> pd.Series:
+    """Program of each grades row."""
+    if layout.grades_has_program:
+        return chunk['Program Name']
+    if layout.attendance_has_program:
+        return lookup.column('Program')
+    return pd.Series('Unknown', index=chunk.index)
+
+
+def _grade_averages(
+    worksheet,
+    layout: _WorkbookLayout,
+    attendance: pd.DataFrame,
+    chunk_size: int
+) -> Tuple[Dict, Optional[float], np.ndarray]:
+    """
+    First pass over the grades sheet.
+
+    Returns (program averages, overall average, matched-attendance mask).
+    The overall average is taken after filling missing grades with their
+    program average, matching impute_missing_grades.
+    """
+    sums: Counter = Counter()
+    counts: Counter = Counter()
+    missing: Counter = Counter()
+    # Grades of rows without a program still count towards the overall average
+    loose_sum, loose_count = 0.0, 0
+    matched = np.zeros(len(attendance), dtype=bool)
+
+    for chunk in iter_sheet_chunks(worksheet, chunk_size):
+        lookup = _AttendanceLookup(attendance, _student_ids(chunk[layout.student_col_g]))
+        matched[lookup.positions[lookup.found]] = True
+
+        grade = normalize_grades(chunk[layout.grade_col]).to_numpy()
+        program = _programs(layout, chunk, lookup)
+        has_program = program.notna().to_numpy()
+        known = ~np.isnan(grade)
+        # The outer merge repeats a grades row once per matching attendance row
+        weight = lookup.column('rows').fillna(1).to_numpy(dtype=float)
+
+        frame = pd.DataFrame({
+            'program': program.to_numpy(),
+            'sum': np.where(known, grade * weight, 0.0),
+            'count': np.where(known, weight, 0.0),
+            'missing': np.where(known, 0.0, weight),
+        })[has_program]
+        totals = frame.groupby('program')[['sum', 'count', 'missing']].sum()
+        sums.update(totals['sum'].to_dict())
+        counts.update(totals['count'].to_dict())
+        missing.update(totals['missing'].to_dict())
+
+        loose = known & ~has_program
+        loose_sum += float((grade[loose] * weight[loose]).sum())
+        loose_count += int(weight[loose].sum())
+
+    # Attendance-only students have no grade; they count as missing in their program
+    unmatched = attendance[~matched]
+    if layout.attendance_has_program:
+        missing.update(unmatched.groupby('Program')['rows'].sum().to_dict())
+    elif not layout.grades_has_program:
+        missing['Unknown'] += int(unmatched['rows'].sum())
+
+    program_avg = {p: sums[p] / counts[p] for p in counts if counts[p] > 0}
+
+    total = loose_sum + sum(sums[p] + missing[p] * program_avg[p] for p in program_avg)
+    count = loose_count + sum(counts[p] + missing[p] for p in program_avg)
+    overall_avg = total / count if count else None
+
+    return program_avg, overall_avg, matched
+
+
+def _score_chunk(
+    student_id: pd.Series,
+    name: pd.Series,
+    program: pd.Series,
+    grade: np.ndarray,
+    attendance_rate: np.ndarray,
+    program_avg: Dict,
+    overall_avg: Optional[float],
+    imputed_by_program: Optional[Counter]
+) -> pd.DataFrame:
+    """Impute missing grades, score and shape one chunk of results."""
+    missing = np.isnan(grade)
+    if missing.any():
+        grade = np.where(missing, program.map(program_avg).to_numpy(dtype=float), grade)
+        if overall_avg is not None:
+            grade = np.where(np.isnan(grade), overall_avg, grade)
+        if imputed_by_program is not None:
+            imputed = missing & ~np.isnan(grade)
+            imputed_by_program.update(program[imputed].fillna('Unknown').astype(str))
+
+    risk_label, recommended_action = score_risk(grade, attendance_rate)
+
+    result = pd.DataFrame({
+        'student_id': student_id.to_numpy(),
+        'student_name': name.to_numpy(),
+        'program': program.to_numpy(),
+        'grade': grade,
+        'attendance_rate': attendance_rate,
+        'risk_label': risk_label,
+        'recommended_action': recommended_action,
+    })
+    result['email'] = generate_emails(result['student_name'])
+    return result[list(RESULT_COLUMNS.values())]
+
+
+def stream_excel_file(
+    file_path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    imputed_by_program: Optional[Counter] = None,
+    progress: ProgressCallback = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream-process an Excel workbook, yielding scored result chunks.
+
+    Follows the same rules as process_excel_file: the attendance sheet is
+    reduced to a keyed table, the grades sheet is read twice (averages for
+    imputation, then scoring), and attendance-only students come last.
+    Duplicate Student# rows keep their first occurrence; only the
+    Student# set and the keyed attendance table grow with the file.
+
+    Args:
+        file_path: Path to an .xlsx workbook
+        chunk_size: Rows per chunk read from each worksheet
+        imputed_by_program: Optional counter updated with imputed grades
+        progress: Optional callback told when each pipeline stage starts
+
+    Yields:
+        DataFrames with the process_excel_file result columns
+    """
+    logger.info(f"Streaming: {file_path} (chunk size {chunk_size})")
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet_names = workbook.sheetnames
+        logger.info(f"Available sheets: {sheet_names}")
+        grades_sheet, attendance_sheet = resolve_sheet_names(sheet_names)
+        grades_ws = workbook[grades_sheet]
+        attendance_ws = workbook[attendance_sheet]
+
+        layout = _WorkbookLayout(_sheet_header(grades_ws), _sheet_header(attendance_ws))
+
+        report_progress(progress, STAGE_READING)
+        attendance = build_attendance_table(
+            attendance_ws, layout.student_col_a, layout.attendance_columns, chunk_size
+        )
+        logger.info(f"Attendance table: {len(attendance)} students")
+
+        report_progress(progress, STAGE_MERGING)
+        program_avg, overall_avg, matched = _grade_averages(
+            grades_ws, layout, attendance, chunk_size
+        )
+
+        report_progress(progress, STAGE_SCORING)
+        seen = set()
+        for chunk in iter_sheet_chunks(grades_ws, chunk_size):
+            # Keep the first row per Student# across all chunks
+            ids = _student_ids(chunk[layout.student_col_g])
+            keep = np.fromiter(
+                (sid not in seen and not seen.add(sid) for sid in ids),
+                dtype=bool, count=len(ids)
+            )
+            if not keep.any():
+                continue
+            chunk = chunk[keep]
+            student_id = ids[keep]
+            lookup = _AttendanceLookup(attendance, student_id)
+
+            if layout.grades_has_name:
+                name = chunk['Student Name']
+                if layout.attendance_has_name:
+                    name = name.fillna(lookup.column('Student Name'))
+            elif layout.attendance_has_name:
+                name = lookup.column('Student Name')
+            else:
+                name = pd.Series('Unknown', index=chunk.index)
+
+            yield _score_chunk(
+                student_id, name, _programs(layout, chunk, lookup),
+                normalize_grades(chunk[layout.grade_col]).to_numpy(),
+                lookup.column('attendance_rate').to_numpy(dtype=float),
+                program_avg, overall_avg, imputed_by_program
+            )
+
+        # Students that only appear on the attendance sheet
+        unmatched = attendance[~matched]
+        for start in range(0, len(unmatched), chunk_size):
+            part = unmatched.iloc[start:start + chunk_size].reset_index()
+
+            if layout.attendance_has_name:
+                name = part['Student Name']
+            else:
+                name = pd.Series(np.nan if layout.grades_has_name else 'Unknown', index=part.index)
+
+            if layout.attendance_has_program:
+                program = part['Program']
+            elif layout.grades_has_program:
+                program = pd.Series(np.nan, index=part.index, dtype=object)
+            else:
+                program = pd.Series('Unknown', index=part.index)
+
+            yield _score_chunk(
+                part['Student#'], name, program, np.full(len(part), np.nan),
+                part['attendance_rate'].to_numpy(dtype=float),
+                program_avg, overall_avg, imputed_by_program
+            )
+    finally:
+        workbook.close()
+
+
+def process_excel_file_streaming(
+    file_path: Path,
+    output_path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: ProgressCallback = None
+) -> Dict:
+    """
+    Stream-process a workbook straight to a results file.
+
+    Scored chunks are appended as they are produced; the persisting stage
+    only finalizes the file.
+
+    Args:
+        file_path: Path to an .xlsx workbook
+        output_path: Results file to write (.csv or .parquet)
+        chunk_size: Rows per chunk
+        progress: Optional callback told when each pipeline stage starts
+
+    Returns:
+        Statistics dictionary with the same keys as process_excel_file
+    """
+    imputed_by_program: Counter = Counter()
+    total = at_risk = safe = 0
+    grade_sum = attendance_sum = 0.0
+    grade_count = attendance_count = 0
+
+    with ResultWriter(output_path) as writer:
+        for result in stream_excel_file(file_path, chunk_size, imputed_by_program, progress):
+            writer.write(result)
+
+            labels = result['risk_label']
+            total += len(result)
+            at_risk += int(labels.isin(['At Risk', 'High Risk']).sum())
+            safe += int((labels == 'Safe').sum())
+            grade_sum += float(result['grade'].sum())
+            grade_count += int(result['grade'].count())
+            attendance_sum += float(result['attendance_rate'].sum())
+            attendance_count += int(result['attendance_rate'].count())
+
+        report_progress(progress, STAGE_PERSISTING)
+
+    return {
+        'total_students': total,
+        'at_risk_count': at_risk,
+        'safe_count': safe,
+        'avg_grade': grade_sum / grade_count if grade_count else 0.0,
+        'avg_attendance': attendance_sum / attendance_count if attendance_count else 0.0,
+        'imputed_grades_by_program': dict(imputed_by_program.most_common())
+    }